@@ -0,0 +1,456 @@
+import asyncio
+import importlib
+import json
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Tuple
+import numpy as np
+
+# One calculator instance per class and process, shared by all batches
+_calculators = {}
+
+
+def _calculator(name):
+    """Instance of the calculator class `name`, defined in the module of the same name"""
+    if name not in _calculators:
+        _calculators[name] = getattr(importlib.import_module(name), name)()
+    return _calculators[name]
+
+
+def _rows(**columns):
+    """Per-request result dicts from equal-length result columns"""
+    names = list(columns)
+    values = [np.asarray(columns[name]).tolist() for name in names]
+    return [dict(zip(names, row)) for row in zip(*values)]
+
+
+def _attenuation(columns):
+    shield = _calculator('RadiationShield')
+    return _rows(final_intensity=shield.calculate_attenuation_batch(
+        columns['initial_intensity'], columns['material'], columns['thickness']))
+
+
+def _required_thickness(columns):
+    shield = _calculator('RadiationShield')
+    return _rows(thickness=shield.calculate_required_thickness_batch(
+        columns['initial_intensity'], columns['target_intensity'], columns['material']))
+
+
+def _decay(columns):
+    calc = _calculator('IsotopeDecayCalculator')
+    half_lives = [calc.medical_isotopes[name] if isinstance(name, str) else name
+                  for name in columns['half_life_hours']]
+    return _rows(remaining=calc.calculate_decay(
+        np.asarray(columns['initial_amount'], dtype=float), np.asarray(half_lives, dtype=float),
+        np.asarray(columns['time_hours'], dtype=float)))
+
+
+def _water_temperature_rise(columns):
+    from NuclearPhysicsCalculator import PHASE_NAMES
+    result = _calculator('NuclearPhysicsCalculator').calculate_water_temperature_rise_batch(
+        columns['energy_joules'], columns['mass_kg'])
+    return _rows(final_temperature=result.final_temperature,
+                 phase=np.array(PHASE_NAMES)[result.phase],
+                 vapor_fraction=result.vapor_fraction,
+                 energy_absorbed=result.energy_absorbed)
+
+
+def _population_metrics(columns):
+    """Same layout as DemographicCalculator.calculate_population_metrics"""
+    from DemographicCalculator import population_metrics_batch
+
+    results = [None] * len(columns['age_distribution'])
+    # Requests with the same age groups share one vectorized call
+    by_groups = defaultdict(list)
+    for i, distribution in enumerate(columns['age_distribution']):
+        by_groups[tuple(distribution)].append(i)
+    for groups, rows in by_groups.items():
+        def take(name):
+            return np.asarray(columns[name])[rows]
+        shares = [[columns['age_distribution'][i][group] for group in groups] for i in rows]
+        metrics = population_metrics_batch(
+            take('base_mortality_rate'), take('healthcare_access'),
+            take('infrastructure_quality'), take('population_size'), shares, list(groups))
+        initial = metrics['initial_population'].tolist()
+        rates = metrics['survival_rate'].tolist()
+        surviving = metrics['surviving_population'].tolist()
+        sizes = take('population_size').tolist()
+        totals = metrics['total_surviving'].tolist()
+        total_rates = metrics['total_survival_rate'].tolist()
+        for k, i in enumerate(rows):
+            result = {
+                group: {'initial_population': initial[k][g], 'survival_rate': rates[k][g],
+                        'surviving_population': surviving[k][g]}
+                for g, group in enumerate(groups)
+            }
+            result['total'] = {'initial_population': sizes[k], 'survival_rate': total_rates[k],
+                               'surviving_population': totals[k]}
+            results[i] = result
+    return results
+
+
+def _gold_conversion(columns):
+    results = _calculator('GoldEnergyConverter').convert_batch(
+        columns['gold_reserves'], columns['gold_price'], columns['oil_price'])
+    return _rows(**results)
+
+
+@dataclass
+class Operation:
+    """A request kind: its arguments and the vectorized batch function"""
+    run: Callable  # Dict of argument columns -> list of result dicts
+    required: Tuple[str, ...]
+    defaults: Dict = field(default_factory=dict)
+    cpu_heavy: bool = False  # Batches go to the process pool when there is one
+
+
+OPERATIONS = {
+    'attenuation': Operation(_attenuation, ('initial_intensity', 'material', 'thickness')),
+    'required_thickness': Operation(_required_thickness,
+                                    ('initial_intensity', 'target_intensity', 'material')),
+    # half_life_hours may also be an isotope name such as "Tc-99m"
+    'decay': Operation(_decay, ('initial_amount', 'half_life_hours', 'time_hours')),
+    'water_temperature_rise': Operation(_water_temperature_rise, ('energy_joules',),
+                                        {'mass_kg': 1.0}),
+    'population_metrics': Operation(
+        _population_metrics,
+        ('base_mortality_rate', 'population_size', 'age_distribution', 'healthcare_access',
+         'infrastructure_quality'),
+        cpu_heavy=True
+    ),
+    'gold_conversion': Operation(_gold_conversion, ('gold_reserves', 'gold_price', 'oil_price')),
+}
+
+
+def _run_batch(name, requests):
+    """Evaluate one batch of argument dicts (also the process-pool entry point)"""
+    operation = OPERATIONS[name]
+    columns = {arg: [request[arg] for request in requests]
+               for arg in (*operation.required, *operation.defaults)}
+    return operation.run(columns)
+
+
+class ServiceError(Exception):
+    """A request the service rejects before it is queued"""
+
+
+def _reject(items, exc):
+    """Fail the futures of queued (args, future) items that are still waiting"""
+    for _, future in items:
+        if not future.done():
+            future.set_exception(exc)
+
+
+class CalculationService:
+    """
+    Serves the calculators from one asyncio process.
+
+    Requests of the same operation that arrive within batch_window seconds
+    are evaluated together with one vectorized call (up to max_batch at a
+    time). Batches of CPU-heavy operations run on a process pool when
+    process_workers is set, at most that many at once per operation; the
+    others run inline on the event loop. Each operation has a bounded
+    queue, so submit() waits for room when the service falls behind. If a
+    batch raises, its requests are retried one by one and only the bad
+    ones fail. stop() lets the batches already running finish and fails
+    the requests still queued with RuntimeError.
+    """
+
+    def __init__(self, batch_window=0.002, max_batch=4096, queue_size=16_384,
+                 process_workers=None):
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.queue_size = queue_size
+        self.process_workers = process_workers
+        self._queues = {}
+        self._tasks = []
+        self._inflight = set()  # Batches running on the process pool
+        self._running = False
+        self._pool = None
+        self.stats = defaultdict(lambda: {'requests': 0, 'batches': 0, 'errors': 0})
+
+    async def start(self):
+        from concurrent.futures import ProcessPoolExecutor
+
+        if self.process_workers:
+            self._pool = ProcessPoolExecutor(self.process_workers)
+        for name in OPERATIONS:
+            self._queues[name] = asyncio.Queue(self.queue_size)
+            self._tasks.append(asyncio.create_task(self._batcher(name)))
+        self._running = True
+        return self
+
+    async def stop(self):
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        await asyncio.gather(*self._inflight, return_exceptions=True)
+        self._reject_queued()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _reject_queued(self):
+        for queue in self._queues.values():
+            items = []
+            while not queue.empty():
+                items.append(queue.get_nowait())
+            _reject(items, RuntimeError("calculation service stopped"))
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def _validate(self, op, args):
+        operation = OPERATIONS.get(op)
+        if operation is None:
+            raise ServiceError(f"unknown operation {op!r}")
+        missing = [name for name in operation.required if name not in args]
+        if missing:
+            raise ServiceError(f"{op}: missing arguments {', '.join(missing)}")
+        return {**operation.defaults, **args}
+
+    async def submit(self, op, **args):
+        """Result dict of one request, evaluated in the next batch of its operation"""
+        args = self._validate(op, args)
+        if not self._running:
+            raise ServiceError("calculation service is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queues[op].put((args, future))
+        if not self._running:
+            # stop() ran while this request waited for room in the queue
+            self._reject_queued()
+        return await future
+
+    async def handle(self, requests):
+        """
+        The batched endpoint: a list of {"op": ..., "args": {...}} requests,
+        answered in order with {"result": ...} or {"error": ...} each
+        """
+        async def one(request):
+            try:
+                return {'result': await self.submit(request['op'], **request.get('args', {}))}
+            except Exception as exc:
+                return {'error': f"{type(exc).__name__}: {exc}"}
+        return await asyncio.gather(*(one(request) for request in requests))
+
+    async def _batcher(self, name):
+        queue = self._queues[name]
+        heavy = OPERATIONS[name].cpu_heavy and self._pool is not None
+        slots = asyncio.Semaphore(self.process_workers if heavy else 1)
+        batch = []
+        try:
+            while True:
+                batch = [await queue.get()]
+                if queue.empty() and self.batch_window > 0:
+                    await asyncio.sleep(self.batch_window)
+                while len(batch) < self.max_batch and not queue.empty():
+                    batch.append(queue.get_nowait())
+
+                self.stats[name]['requests'] += len(batch)
+                self.stats[name]['batches'] += 1
+                await slots.acquire()
+                if heavy:
+                    task = asyncio.create_task(self._execute(name, batch, slots))
+                    self._inflight.add(task)
+                    task.add_done_callback(self._inflight.discard)
+                else:
+                    await self._execute(name, batch, slots)
+        except asyncio.CancelledError:
+            # A batch taken off the queue but not yet started
+            _reject(batch, RuntimeError("calculation service stopped"))
+            raise
+
+    async def _evaluate(self, name, requests):
+        if OPERATIONS[name].cpu_heavy and self._pool is not None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, _run_batch, name, requests)
+        return _run_batch(name, requests)
+
+    async def _execute(self, name, batch, slots):
+        try:
+            try:
+                results = await self._evaluate(name, [args for args, _ in batch])
+            except Exception:
+                if len(batch) == 1:
+                    raise
+                # Isolate the requests that fail
+                for item in batch:
+                    await self._execute(name, [item], _Unbounded)
+                return
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        except Exception as exc:
+            self.stats[name]['errors'] += len(batch)
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        finally:
+            slots.release()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        """
+        Newline-delimited JSON over TCP: each line is {"id": ..., "requests":
+        [...]} and is answered with {"id": ..., "responses": [...]}; lines of
+        one connection are handled concurrently and may be answered out of
+        order
+        """
+        async def connection(reader, writer):
+            inflight = set()
+            lock = asyncio.Lock()
+
+            async def answer(line):
+                try:
+                    message = json.loads(line)
+                    reply = {'id': message.get('id'),
+                             'responses': await self.handle(message['requests'])}
+                except (ValueError, KeyError, TypeError) as exc:
+                    reply = {'id': None, 'error': f"bad message: {exc}"}
+                async with lock:
+                    writer.write(json.dumps(reply).encode() + b'\n')
+                    await writer.drain()
+
+            try:
+                while line := await reader.readline():
+                    task = asyncio.create_task(answer(line))
+                    inflight.add(task)
+                    task.add_done_callback(inflight.discard)
+                await asyncio.gather(*inflight)
+            finally:
+                writer.close()
+
+        return await asyncio.start_server(connection, host, port, limit=2 ** 24)
+
+
+class _Unbounded:
+    """Stand-in semaphore for the one-by-one retries of a failed batch"""
+
+    @staticmethod
+    def release():
+        pass
+
+
+class InProcessClient:
+    """Client calling a CalculationService in the same event loop"""
+
+    def __init__(self, service):
+        self.service = service
+
+    async def call(self, op, **args):
+        return await self.service.submit(op, **args)
+
+    async def batch(self, requests):
+        return await self.service.handle(requests)
+
+
+class StreamClient:
+    """Client of CalculationService.serve over one TCP connection"""
+
+    def __init__(self, reader, writer):
+        self._reader = reader
+        self._writer = writer
+        self._waiting = {}
+        self._ids = 0
+        self._receiver = asyncio.create_task(self._receive())
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765):
+        reader, writer = await asyncio.open_connection(host, port, limit=2 ** 24)
+        return cls(reader, writer)
+
+    async def _receive(self):
+        while line := await self._reader.readline():
+            reply = json.loads(line)
+            future = self._waiting.pop(reply['id'], None)
+            if future is not None:
+                future.set_result(reply)
+
+    async def batch(self, requests):
+        self._ids += 1
+        future = asyncio.get_running_loop().create_future()
+        self._waiting[self._ids] = future
+        self._writer.write(json.dumps({'id': self._ids, 'requests': requests}).encode() + b'\n')
+        await self._writer.drain()
+        reply = await future
+        if 'error' in reply:
+            raise ServiceError(reply['error'])
+        return reply['responses']
+
+    async def call(self, op, **args):
+        response = (await self.batch([{'op': op, 'args': args}]))[0]
+        if 'error' in response:
+            raise ServiceError(response['error'])
+        return response['result']
+
+    async def close(self):
+        self._writer.close()
+        self._receiver.cancel()
+
+
+async def _demo():
+    async with CalculationService() as service:
+        client = InProcessClient(service)
+        start = time.perf_counter()
+        thicknesses = await asyncio.gather(*(
+            client.call('required_thickness', initial_intensity=1000.0, target_intensity=target,
+                        material=material)
+            for material in ("lead", "concrete", "water") for target in (100.0, 10.0, 1.0)
+        ))
+        responses = await client.batch([
+            {'op': 'decay', 'args': {'initial_amount': 1000.0, 'half_life_hours': 'Tc-99m',
+                                     'time_hours': 24.0}},
+            {'op': 'water_temperature_rise', 'args': {'energy_joules': 1e6}},
+            {'op': 'gold_conversion', 'args': {'gold_reserves': 8133.5, 'gold_price': 2000.0,
+                                               'oil_price': 80.0}},
+            {'op': 'attenuation', 'args': {'initial_intensity': 1000.0, 'material': 'unobtainium',
+                                           'thickness': 1.0}},
+        ])
+        elapsed = time.perf_counter() - start
+
+        print("Calculation Service")
+        print("===================")
+        print("Required thickness (cm) for 1000 -> 100 / 10 / 1:")
+        for i, material in enumerate(("lead", "concrete", "water")):
+            values = [r['thickness'] for r in thicknesses[3 * i:3 * i + 3]]
+            print(f"  {material:<9}" + "".join(f"{v:>10.2f}" for v in values))
+        print(f"Tc-99m left after 24 h: {responses[0]['result']['remaining']:.2f}")
+        print(f"Water after 1 MJ: {responses[1]['result']['final_temperature']:.1f} °C "
+              f"({responses[1]['result']['phase']})")
+        print(f"Years of US energy: {responses[2]['result']['years_of_energy']:.2f}")
+        print(f"Bad request: {responses[3]['error']}")
+        print(f"Answered in {elapsed * 1000:.1f} ms; batches: "
+              + ", ".join(f"{name} {s['batches']}" for name, s in service.stats.items()))
+
+
+async def _serve_forever(host, port, process_workers):
+    async with CalculationService(process_workers=process_workers) as service:
+        server = await service.serve(host, port)
+        print(f"Serving on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Batched calculation service")
+    parser.add_argument("--serve", action="store_true", help="run the TCP service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--process-workers", type=int, default=None,
+                        help="process pool for CPU-heavy batches")
+    args = parser.parse_args()
+    if args.serve:
+        asyncio.run(_serve_forever(args.host, args.port, args.process_workers))
+    else:
+        asyncio.run(_demo())
+
+
+if __name__ == "__main__":
+    main()
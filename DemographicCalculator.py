@@ -1,9 +1,19 @@
 import numpy as np
-import pandas as pd
-from scipy import stats
-import matplotlib.pyplot as plt
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import dataclass, fields
 from typing import List, Dict
+from PlotRenderer import figure, finish
+from Instrumentation import instrument
+from RecordTables import RecordTable, RecordView
+
+# Survival adjustment by age group
+AGE_FACTORS = {
+    '0-14': 0.99,
+    '15-24': 0.98,
+    '25-54': 0.97,
+    '55-64': 0.95,
+    '65+': 0.92
+}
 
 @dataclass
 class PopulationParams:
@@ -14,63 +24,534 @@ class PopulationParams:
     healthcare_access: float  # 0 to 1
     infrastructure_quality: float  # 0 to 1
 
+@dataclass
+class ProjectionResult:
+    """Quantile bands of a stochastic population projection"""
+    years: np.ndarray  # 0 .. n_years
+    quantiles: np.ndarray  # Quantile levels of the bands
+    total_bands: np.ndarray  # (years, quantiles) total population
+    age_bands: np.ndarray  # (years, quantiles, ages) population by single-year age
+    mean_total: np.ndarray  # (years,) mean total population over replicates
+
+def scenario_dtype(n_groups: int) -> np.dtype:
+    """Record layout of a ScenarioTable with n_groups age groups"""
+    return np.dtype([
+        ('base_mortality_rate', 'f8'),
+        ('life_expectancy', 'f8'),
+        ('population_size', 'i8'),
+        ('healthcare_access', 'f8'),
+        ('infrastructure_quality', 'f8'),
+        ('age_shares', 'f8', (n_groups,)),
+        # Filled in by population_metrics_table
+        ('initial_population', 'i8', (n_groups,)),
+        ('survival_rate', 'f8', (n_groups,)),
+        ('surviving_population', 'i8', (n_groups,)),
+        ('total_surviving', 'i8'),
+        ('total_survival_rate', 'f8')
+    ])
+
+class ScenarioRow(RecordView):
+    """Row of a ScenarioTable; reads like PopulationParams, so DemographicCalculator accepts it"""
+    __slots__ = ()
+
+    @property
+    def age_distribution(self) -> Dict[str, float]:
+        return dict(zip(self._table.age_groups, self.age_shares.tolist()))
+
+    def to_params(self) -> PopulationParams:
+        return PopulationParams(self.base_mortality_rate, self.life_expectancy, self.population_size,
+                                self.age_distribution, self.healthcare_access,
+                                self.infrastructure_quality)
+
+    def metrics(self) -> Dict:
+        """Results in the calculate_population_metrics layout (after population_metrics_table)"""
+        initial = self.initial_population.tolist()
+        rates = self.survival_rate.tolist()
+        surviving = self.surviving_population.tolist()
+        metrics = {
+            group: {'initial_population': initial[g], 'survival_rate': rates[g],
+                    'surviving_population': surviving[g]}
+            for g, group in enumerate(self._table.age_groups)
+        }
+        metrics['total'] = {
+            'initial_population': self.population_size,
+            'survival_rate': self.total_survival_rate,
+            'surviving_population': self.total_surviving
+        }
+        return metrics
+
+class ScenarioTable(RecordTable):
+    """
+    Population scenarios and their metrics as one structured array
+
+    With 5 age groups a scenario takes about 200 bytes of array,
+    instead of a PopulationParams plus a dict of dicts per scenario.
+    """
+    row_base = ScenarioRow
+
+    def __init__(self, data, age_groups):
+        super().__init__(data)
+        self.age_groups = list(age_groups)
+
+    def _subset(self, data):
+        return type(self)(data, self.age_groups)
+
+    @classmethod
+    def empty(cls, n: int, age_groups) -> 'ScenarioTable':
+        return cls(np.zeros(n, dtype=scenario_dtype(len(age_groups))), age_groups)
+
+    @classmethod
+    def from_params(cls, params: List[PopulationParams]) -> 'ScenarioTable':
+        """Table of PopulationParams sharing the age groups of the first one"""
+        age_groups = list(params[0].age_distribution)
+        table = cls.empty(len(params), age_groups)
+        for name in ('base_mortality_rate', 'life_expectancy', 'population_size',
+                     'healthcare_access', 'infrastructure_quality'):
+            table.data[name] = [getattr(p, name) for p in params]
+        table.data['age_shares'] = [[p.age_distribution[group] for group in age_groups] for p in params]
+        return table
+
+    def metric_records(self) -> List[Dict]:
+        """Per-scenario metrics dicts, as calculate_population_metrics returns them"""
+        return [row.metrics() for row in self]
+
+def age_range(age_group: str, max_age: int) -> range:
+    """Single-year ages covered by an age group label such as '15-24' or '65+'"""
+    if age_group.endswith('+'):
+        return range(int(age_group[:-1]), max_age + 1)
+    low, high = age_group.split('-')
+    return range(int(low), min(int(high), max_age) + 1)
+
+def population_metrics_batch(base_mortality_rate, healthcare_access, infrastructure_quality,
+                             population_size, age_shares, age_groups) -> Dict[str, np.ndarray]:
+    """
+    Vectorized calculate_population_metrics for many scenarios at once
+
+    Parameters:
+    base_mortality_rate, healthcare_access, infrastructure_quality,
+    population_size: Arrays of shape (scenarios,)
+    age_shares: Array (scenarios, groups) of age distribution shares
+    age_groups: Group labels matching the columns of age_shares
+
+    Returns:
+    Dict of arrays: per-group 'initial_population', 'survival_rate' and
+    'surviving_population' of shape (scenarios, groups), plus the
+    scenario totals 'total_surviving' and 'total_survival_rate'
+    """
+    base_rate = 1.0 - np.asarray(base_mortality_rate, dtype=float)
+    age_factor = np.array([AGE_FACTORS.get(group, 1.0) for group in age_groups])
+    healthcare_factor = 0.95 + (0.05 * np.asarray(healthcare_access, dtype=float))
+    infrastructure_factor = 0.95 + (0.05 * np.asarray(infrastructure_quality, dtype=float))
+    population_size = np.asarray(population_size)
+
+    # Same operation order as the scalar path so results match exactly
+    survival_rate = base_rate[:, None] * age_factor * healthcare_factor[:, None] * \
+        infrastructure_factor[:, None]
+    initial = np.floor(population_size[:, None] * np.asarray(age_shares, dtype=float)).astype(np.int64)
+    surviving = np.floor(initial * survival_rate).astype(np.int64)
+    total_surviving = surviving.sum(axis=1)
+
+    return {
+        'initial_population': initial,
+        'survival_rate': survival_rate,
+        'surviving_population': surviving,
+        'total_surviving': total_surviving,
+        'total_survival_rate': total_surviving / population_size
+    }
+
+def population_metrics_table(scenarios: ScenarioTable, chunk_size: int = 1_000_000) -> ScenarioTable:
+    """Fill the metric columns of a ScenarioTable in place (chunked) and return it"""
+    data = scenarios.data
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        metrics = population_metrics_batch(
+            chunk['base_mortality_rate'], chunk['healthcare_access'],
+            chunk['infrastructure_quality'], chunk['population_size'], chunk['age_shares'],
+            scenarios.age_groups
+        )
+        chunk['initial_population'] = metrics['initial_population']
+        chunk['survival_rate'] = metrics['survival_rate']
+        chunk['surviving_population'] = metrics['surviving_population']
+        chunk['total_surviving'] = metrics['total_surviving']
+        chunk['total_survival_rate'] = metrics['total_survival_rate']
+    return scenarios
+
+def _sweep_chunk(start, stop, axes, age_groups, population_size, life_expectancy):
+    """Metrics table for scenarios [start, stop) of a Cartesian parameter grid"""
+    import pandas as pd
+
+    mortality, healthcare, infrastructure, age_shares = axes
+    i_mort, i_health, i_infra, i_age = np.unravel_index(
+        np.arange(start, stop),
+        (len(mortality), len(healthcare), len(infrastructure), len(age_shares))
+    )
+    n = stop - start
+    sizes = np.full(n, population_size, dtype=np.int64)
+    metrics = population_metrics_batch(
+        mortality[i_mort], healthcare[i_health], infrastructure[i_infra],
+        sizes, age_shares[i_age], age_groups
+    )
+
+    columns = {
+        'scenario': np.arange(start, stop),
+        'base_mortality_rate': mortality[i_mort],
+        'healthcare_access': healthcare[i_health],
+        'infrastructure_quality': infrastructure[i_infra],
+        'age_distribution': i_age,
+        'life_expectancy': np.full(n, life_expectancy),
+        'initial_population': sizes,
+        'surviving_population': metrics['total_surviving'],
+        'survival_rate': metrics['total_survival_rate']
+    }
+    for g, group in enumerate(age_groups):
+        columns[f'{group}_initial_population'] = metrics['initial_population'][:, g]
+        columns[f'{group}_survival_rate'] = metrics['survival_rate'][:, g]
+        columns[f'{group}_surviving_population'] = metrics['surviving_population'][:, g]
+    return pd.DataFrame(columns)
+
+def _sweep_chunk_job(args):
+    return _sweep_chunk(*args)
+
+class _SweepWriter:
+    """Append sweep chunks to a Parquet (pyarrow) or CSV file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith('.parquet')
+        self._writer = None
+        self._header = True
+
+    def write(self, frame):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='w' if self._header else 'a',
+                         header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+class _Graph:
+    """
+    Memoized derived quantities with dependency tracking
+
+    A node's dependencies are parameter names (read through read_input on
+    every evaluation) or other nodes. A node is recomputed only when one of
+    them changed; a recomputed node whose value comes out equal keeps its
+    revision, so its dependents stay cached.
+    """
+
+    def __init__(self, read_input):
+        self._read = read_input
+        self._nodes = {}  # name -> (dependencies, function)
+        self._cache = {}  # name -> (dependency stamps, value, revision)
+        self.recomputed = Counter()  # Evaluations per node, for inspection
+
+    def define(self, name, dependencies, function):
+        self._nodes[name] = (tuple(dependencies), function)
+        self._cache.pop(name, None)
+
+    def _resolve(self, dependency):
+        """(stamp, value) of a dependency; nodes are stamped by revision"""
+        if dependency in self._nodes:
+            value = self.value(dependency)
+            return ('node', self._cache[dependency][2]), value
+        value = self._read(dependency)
+        return ('input', value), value
+
+    def value(self, name):
+        dependencies, function = self._nodes[name]
+        resolved = [self._resolve(d) for d in dependencies]
+        stamps = tuple(stamp for stamp, _ in resolved)
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == stamps:
+            return cached[1]
+
+        value = function(*(value for _, value in resolved))
+        self.recomputed[name] += 1
+        if cached is None:
+            revision = 0
+        else:
+            revision = cached[2] if cached[1] == value else cached[2] + 1
+        self._cache[name] = (stamps, value, revision)
+        return value
+
+    def clear(self):
+        self._cache.clear()
+
+@instrument('calculate_population_metrics', 'run_parameter_sweep', 'project_population')
 class DemographicCalculator:
     def __init__(self, params: PopulationParams):
+        # params may also be a ScenarioRow of a ScenarioTable
         self.params = params
         self.age_groups = list(params.age_distribution.keys())
-        
+        self._graph = self._build_graph()
+
+    def __getstate__(self):
+        # The graph's nodes are closures; a copy rebuilds them (with cold caches)
+        state = self.__dict__.copy()
+        del state['_graph']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._graph = self._build_graph()
+
+    def _read_param(self, name):
+        value = getattr(self.params, name)
+        # Snapshot mutable inputs so in-place edits are seen as changes
+        return tuple(value.items()) if isinstance(value, dict) else value
+
+    def _build_graph(self) -> _Graph:
+        """
+        Derived quantities behind the metrics and the report
+
+        Editing one field of self.params (or replacing it) only recomputes
+        the nodes downstream of that field, e.g. healthcare_access touches
+        the resource factor, survival rates, survivors and their report
+        sections but not the group populations or the input section.
+        """
+        graph = _Graph(self._read_param)
+        groups = self.age_groups
+
+        graph.define('base_rates', ['base_mortality_rate'], lambda mortality: {
+            group: (1.0 - mortality) * AGE_FACTORS.get(group, 1.0) for group in groups
+        })
+        graph.define('resource_factors', ['healthcare_access', 'infrastructure_quality'],
+                     lambda healthcare, infrastructure: (0.95 + (0.05 * healthcare),
+                                                         0.95 + (0.05 * infrastructure)))
+        graph.define('survival_rates', ['base_rates', 'resource_factors'],
+                     lambda base_rates, factors: {
+                         group: base_rates[group] * factors[0] * factors[1] for group in groups
+                     })
+        graph.define('group_populations', ['population_size', 'age_distribution'],
+                     lambda size, distribution: {
+                         group: int(size * dict(distribution)[group]) for group in groups
+                     })
+        graph.define('surviving', ['group_populations', 'survival_rates'],
+                     lambda populations, rates: {
+                         group: int(populations[group] * rates[group]) for group in groups
+                     })
+        graph.define('totals', ['population_size', 'surviving'], lambda size, surviving: {
+            'initial_population': size,
+            'survival_rate': sum(surviving.values()) / size,
+            'surviving_population': sum(surviving.values())
+        })
+
+        # Report sections, each re-rendered only when its own inputs change
+        graph.define('report:inputs', [f.name for f in fields(PopulationParams)],
+                     self._render_inputs)
+        for group in groups:
+            graph.define(f'group:{group}', ['group_populations', 'survival_rates', 'surviving'],
+                         lambda populations, rates, surviving, group=group: {
+                             'initial_population': populations[group],
+                             'survival_rate': rates[group],
+                             'surviving_population': surviving[group]
+                         })
+            graph.define(f'report:{group}', [f'group:{group}'],
+                         lambda data, group=group: self._render_group(group, data))
+        graph.define('report:total', ['totals'], self._render_total)
+        return graph
+
     def calculate_base_survival_rate(self, age_group: str) -> float:
         """Calculate base survival rate for an age group"""
-        base_rate = 1.0 - self.params.base_mortality_rate
-        
-        # Adjust for age group
-        age_factor = {
-            '0-14': 0.99,
-            '15-24': 0.98,
-            '25-54': 0.97,
-            '55-64': 0.95,
-            '65+': 0.92
-        }
-        
-        return base_rate * age_factor.get(age_group, 1.0)
+        base_rates = self._graph.value('base_rates')
+        if age_group in base_rates:
+            return base_rates[age_group]
+        return (1.0 - self.params.base_mortality_rate) * AGE_FACTORS.get(age_group, 1.0)
     
     def adjust_for_resources(self, base_rate: float) -> float:
         """Adjust survival rate based on healthcare and infrastructure"""
-        healthcare_factor = 0.95 + (0.05 * self.params.healthcare_access)
-        infrastructure_factor = 0.95 + (0.05 * self.params.infrastructure_quality)
+        healthcare_factor, infrastructure_factor = self._graph.value('resource_factors')
         
         return base_rate * healthcare_factor * infrastructure_factor
     
     def calculate_population_metrics(self) -> Dict:
         """Calculate various population metrics"""
-        metrics = {}
-        total_surviving = 0
-        
-        for age_group in self.age_groups:
-            population_in_group = int(self.params.population_size * 
-                                   self.params.age_distribution[age_group])
-            
-            base_rate = self.calculate_base_survival_rate(age_group)
-            adjusted_rate = self.adjust_for_resources(base_rate)
-            
-            surviving = int(population_in_group * adjusted_rate)
-            total_surviving += surviving
-            
-            metrics[age_group] = {
-                'initial_population': population_in_group,
-                'survival_rate': adjusted_rate,
-                'surviving_population': surviving
-            }
-            
-        metrics['total'] = {
-            'initial_population': self.params.population_size,
-            'survival_rate': total_surviving / self.params.population_size,
-            'surviving_population': total_surviving
-        }
-        
+        metrics = {group: dict(self._graph.value(f'group:{group}')) for group in self.age_groups}
+        metrics['total'] = dict(self._graph.value('totals'))
         return metrics
     
-    def plot_population_pyramid(self, metrics: Dict):
+    def run_parameter_sweep(self, base_mortality_rate=None, healthcare_access=None,
+                            infrastructure_quality=None, age_distributions=None,
+                            chunk_size: int = 100_000, max_workers: int = None,
+                            output_path: str = None, as_table: bool = False):
+        """
+        Evaluate the population metrics over a Cartesian grid of scenarios
+
+        Each axis defaults to the calculator's own parameter. The grid is
+        split into chunks that are computed vectorized, optionally on a
+        process pool, and streamed into a columnar table.
+
+        Parameters:
+        base_mortality_rate, healthcare_access, infrastructure_quality:
+            Sequences of values to sweep
+        age_distributions: Sequence of age distribution dicts with the
+            same age groups as the calculator; the 'age_distribution'
+            column holds the position in this sequence
+        chunk_size: Scenarios per chunk
+        max_workers: Shard chunks over this many processes; None or 1
+            computes in-process
+        output_path: Stream chunks to this .parquet (requires pyarrow)
+            or .csv file instead of returning them
+        as_table: Return a ScenarioTable instead, computed in-process
+            (max_workers and output_path are ignored)
+
+        Returns:
+        pandas DataFrame with one row per scenario, ScenarioTable, or output_path
+        """
+        def axis(values, default):
+            return np.atleast_1d(np.asarray(default if values is None else values, dtype=float))
+
+        distributions = age_distributions or [self.params.age_distribution]
+        age_shares = np.array([[d[group] for group in self.age_groups] for d in distributions])
+        axes = (
+            axis(base_mortality_rate, self.params.base_mortality_rate),
+            axis(healthcare_access, self.params.healthcare_access),
+            axis(infrastructure_quality, self.params.infrastructure_quality),
+            age_shares
+        )
+        n_scenarios = int(np.prod([len(a) for a in axes]))
+        if as_table:
+            mortality, healthcare, infrastructure, shares = axes
+            i_mort, i_health, i_infra, i_age = np.unravel_index(
+                np.arange(n_scenarios), [len(a) for a in axes]
+            )
+            table = ScenarioTable.empty(n_scenarios, self.age_groups)
+            table.data['base_mortality_rate'] = mortality[i_mort]
+            table.data['healthcare_access'] = healthcare[i_health]
+            table.data['infrastructure_quality'] = infrastructure[i_infra]
+            table.data['age_shares'] = shares[i_age]
+            table.data['life_expectancy'] = self.params.life_expectancy
+            table.data['population_size'] = self.params.population_size
+            return population_metrics_table(table, chunk_size)
+
+        jobs = [
+            (start, min(start + chunk_size, n_scenarios), axes, self.age_groups,
+             self.params.population_size, self.params.life_expectancy)
+            for start in range(0, n_scenarios, chunk_size)
+        ]
+
+        import pandas as pd
+        from concurrent.futures import ProcessPoolExecutor
+
+        writer = _SweepWriter(output_path) if output_path else None
+        frames = []
+        pool = ProcessPoolExecutor(max_workers) if max_workers not in (None, 1) else None
+        try:
+            chunks = pool.map(_sweep_chunk_job, jobs) if pool else map(_sweep_chunk_job, jobs)
+            for frame in chunks:
+                if writer:
+                    writer.write(frame)
+                else:
+                    frames.append(frame)
+        finally:
+            if pool:
+                pool.shutdown()
+            if writer:
+                writer.close()
+
+        return output_path if writer else pd.concat(frames, ignore_index=True)
+
+    def single_year_population(self, max_age: int = 100) -> np.ndarray:
+        """Expected population by single-year age, spreading each group evenly over its ages"""
+        population = np.zeros(max_age + 1)
+        for age_group in self.age_groups:
+            ages = age_range(age_group, max_age)
+            share = self.params.population_size * self.params.age_distribution[age_group]
+            population[ages.start:ages.stop] += share / len(ages)
+        return population
+
+    def single_year_survival(self, max_age: int = 100) -> np.ndarray:
+        """Annual survival probability by single-year age"""
+        survival = np.full(max_age + 1, self.adjust_for_resources(1.0 - self.params.base_mortality_rate))
+        for age_group in self.age_groups:
+            ages = age_range(age_group, max_age)
+            survival[ages.start:ages.stop] = self.adjust_for_resources(
+                self.calculate_base_survival_rate(age_group)
+            )
+        return survival
+
+    def project_population(self, years: int, replicates: int = 1000,
+                           fertility: np.ndarray = None, migration: np.ndarray = None,
+                           total_fertility_rate: float = 2.1, max_age: int = 100,
+                           quantiles=(0.05, 0.5, 0.95), seed=None) -> ProjectionResult:
+        """
+        Stochastic Leslie-matrix projection with single-year ages
+
+        All replicates advance together as a (replicates x ages) array. Each
+        year survivors are binomial draws that age by one year (the last age
+        is open-ended), births are Poisson draws from the age-specific
+        fertility, and migration is applied as Poisson inflow / binomial
+        outflow. Only the quantile bands are kept, not the trajectories.
+
+        Parameters:
+        years: Number of years to project
+        replicates: Number of Monte Carlo replicates
+        fertility: Births per person per year by age (default: total_fertility_rate
+                   spread evenly over ages 15-49, half the births per person)
+        migration: Net migration rate by age as a fraction of the population
+                   per year; positive for inflow, negative for outflow
+        max_age: Oldest single-year age (open-ended)
+        quantiles: Quantile levels of the returned bands
+        seed: Seed or np.random.Generator
+
+        Returns:
+        ProjectionResult
+        """
+        rng = np.random.default_rng(seed)
+        n_ages = max_age + 1
+        survival = self.single_year_survival(max_age)
+
+        if fertility is None:
+            fertility = np.zeros(n_ages)
+            fertility[15:50] = total_fertility_rate / 2 / 35
+        fertility = np.asarray(fertility, dtype=float)
+        migration = np.zeros(n_ages) if migration is None else np.asarray(migration, dtype=float)
+        inflow = np.clip(migration, 0, None)
+        outflow = np.clip(-migration, 0, 1)
+
+        quantiles = np.asarray(quantiles, dtype=float)
+        total_bands = np.empty((years + 1, len(quantiles)))
+        age_bands = np.empty((years + 1, len(quantiles), n_ages))
+        mean_total = np.empty(years + 1)
+
+        start = self.single_year_population(max_age)
+        population = np.tile(np.floor(start).astype(np.int64), (replicates, 1))
+
+        def record(year):
+            totals = population.sum(axis=1)
+            total_bands[year] = np.quantile(totals, quantiles)
+            age_bands[year] = np.quantile(population, quantiles, axis=0)
+            mean_total[year] = totals.mean()
+
+        record(0)
+        for year in range(1, years + 1):
+            births = rng.poisson(population @ fertility)
+            survivors = rng.binomial(population, survival)
+
+            # Age everyone by one year; the last age group is open-ended
+            population[:, 1:] = survivors[:, :-1]
+            population[:, -1] += survivors[:, -1]
+            population[:, 0] = births
+
+            if inflow.any():
+                population += rng.poisson(population * inflow)
+            if outflow.any():
+                population -= rng.binomial(population, outflow)
+
+            record(year)
+
+        return ProjectionResult(np.arange(years + 1), quantiles, total_bands, age_bands, mean_total)
+
+    def plot_population_pyramid(self, metrics: Dict, output_path: str = None):
         """Create population pyramid before and after"""
         age_groups = [group for group in self.age_groups if group != 'total']
         initial_pop = [metrics[group]['initial_population'] for group in age_groups]
@@ -78,7 +559,7 @@ class DemographicCalculator:
         
         y_pos = np.arange(len(age_groups))
         
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 8))
+        fig, (ax1, ax2) = figure('population_pyramid', figsize=(15, 8), ncols=2)
         
         # Initial population
         ax1.barh(y_pos, initial_pop)
@@ -92,38 +573,51 @@ class DemographicCalculator:
         ax2.set_yticklabels(age_groups)
         ax2.set_title('Final Population Distribution')
         
-        plt.tight_layout()
-        plt.show()
+        fig.tight_layout()
+        return finish(fig, output_path)
     
+    @staticmethod
+    def _render_inputs(base_mortality_rate, life_expectancy, population_size, age_distribution,
+                       healthcare_access, infrastructure_quality) -> str:
+        return (
+            "Input Parameters:\n"
+            f"Base Mortality Rate: {base_mortality_rate:.2%}\n"
+            f"Life Expectancy: {life_expectancy} years\n"
+            f"Population Size: {population_size:,}\n"
+            f"Healthcare Access Level: {healthcare_access:.2%}\n"
+            f"Infrastructure Quality: {infrastructure_quality:.2%}\n\n"
+        )
+
+    @staticmethod
+    def _render_group(age_group, data) -> str:
+        return (
+            f"\n{age_group}:\n"
+            f"  Initial Population: {data['initial_population']:,}\n"
+            f"  Survival Rate: {data['survival_rate']:.2%}\n"
+            f"  Final Population: {data['surviving_population']:,}\n"
+        )
+
+    @staticmethod
+    def _render_total(total) -> str:
+        return (
+            "\nOverall Results:\n"
+            f"Total Initial Population: {total['initial_population']:,}\n"
+            f"Average Survival Rate: {total['survival_rate']:.2%}\n"
+            f"Total Final Population: {total['surviving_population']:,}\n"
+        )
+
     def generate_report(self) -> str:
         """Generate a detailed report of the analysis"""
-        metrics = self.calculate_population_metrics()
-        
-        report = "Population Demographics Analysis\n"
-        report += "================================\n\n"
-        
-        report += "Input Parameters:\n"
-        report += f"Base Mortality Rate: {self.params.base_mortality_rate:.2%}\n"
-        report += f"Life Expectancy: {self.params.life_expectancy} years\n"
-        report += f"Population Size: {self.params.population_size:,}\n"
-        report += f"Healthcare Access Level: {self.params.healthcare_access:.2%}\n"
-        report += f"Infrastructure Quality: {self.params.infrastructure_quality:.2%}\n\n"
-        
-        report += "Results by Age Group:\n"
-        report += "--------------------\n"
-        for age_group, data in metrics.items():
-            if age_group != 'total':
-                report += f"\n{age_group}:\n"
-                report += f"  Initial Population: {data['initial_population']:,}\n"
-                report += f"  Survival Rate: {data['survival_rate']:.2%}\n"
-                report += f"  Final Population: {data['surviving_population']:,}\n"
-        
-        report += f"\nOverall Results:\n"
-        report += f"Total Initial Population: {metrics['total']['initial_population']:,}\n"
-        report += f"Average Survival Rate: {metrics['total']['survival_rate']:.2%}\n"
-        report += f"Total Final Population: {metrics['total']['surviving_population']:,}\n"
-        
-        return report
+        sections = [
+            "Population Demographics Analysis\n",
+            "================================\n\n",
+            self._graph.value('report:inputs'),
+            "Results by Age Group:\n",
+            "--------------------\n"
+        ]
+        sections += [self._graph.value(f'report:{group}') for group in self.age_groups]
+        sections.append(self._graph.value('report:total'))
+        return "".join(sections)
 
 def main():
     # Example parameters for a sample population
@@ -148,9 +642,17 @@ def main():
     # Generate and print report
     print(calc.generate_report())
     
+    # Stochastic 20-year projection
+    projection = calc.project_population(years=20, replicates=1000, seed=42)
+    print("Projected Total Population (5% / 50% / 95%):")
+    for year in (0, 5, 10, 20):
+        low, median, high = projection.total_bands[year]
+        print(f"Year {year:>2}: {low:,.0f} / {median:,.0f} / {high:,.0f}")
+    
     # Plot population distribution
     metrics = calc.calculate_population_metrics()
-    calc.plot_population_pyramid(metrics)
+    path = calc.plot_population_pyramid(metrics, output_path="population_pyramid.png")
+    print(f"Population pyramid saved to {path}")
 
 if __name__ == "__main__":
     main()
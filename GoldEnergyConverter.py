@@ -1,3 +1,101 @@
+import numpy as np
+from collections import deque
+from dataclasses import dataclass, field
+from Instrumentation import instrument
+
+# Input columns of a scenario batch, in positional order
+INPUT_COLUMNS = ('gold_reserves', 'gold_price', 'oil_price')
+
+@dataclass
+class BatchReport:
+    """Result of GoldEnergyConverter.generate_report_batch"""
+    columns: dict = None  # Column name -> array over all rows (None when written to a file)
+    output_path: str = None
+    n_rows: int = 0
+    reports: dict = field(default_factory=dict)  # Row index -> formatted report text
+
+def _read_scenarios(source, chunk_size):
+    """Yield dicts of INPUT_COLUMNS arrays, at most chunk_size rows each"""
+    if isinstance(source, str):
+        if source.endswith('.parquet'):
+            import pyarrow.parquet as pq
+            for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size,
+                                                             columns=list(INPUT_COLUMNS)):
+                yield {name: batch.column(name).to_numpy() for name in INPUT_COLUMNS}
+        else:
+            import pandas as pd
+            for frame in pd.read_csv(source, usecols=list(INPUT_COLUMNS), chunksize=chunk_size):
+                yield {name: frame[name].to_numpy() for name in INPUT_COLUMNS}
+        return
+
+    if not isinstance(source, dict):
+        source = dict(zip(INPUT_COLUMNS, source))
+    arrays = np.broadcast_arrays(*(np.asarray(source[name], dtype=float).ravel()
+                                   for name in INPUT_COLUMNS))
+    for start in range(0, len(arrays[0]), chunk_size):
+        yield {name: a[start:start + chunk_size] for name, a in zip(INPUT_COLUMNS, arrays)}
+
+# Per-tick record of an EnergyBacktest run
+BACKTEST_DTYPE = np.dtype([
+    ('years_of_energy', 'f8'),
+    ('rolling_mean', 'f8'),
+    ('rolling_std', 'f8'),
+    ('rolling_min', 'f8'),
+    ('rolling_max', 'f8'),
+    ('drawdown', 'f8'),       # Fraction below the running peak
+    ('max_drawdown', 'f8')    # Largest drawdown so far
+])
+
+@dataclass
+class BacktestSnapshot:
+    """Backtest state after one tick"""
+    tick: int
+    years_of_energy: float
+    rolling_mean: float
+    rolling_std: float
+    rolling_min: float
+    rolling_max: float
+    peak: float
+    drawdown: float
+    max_drawdown: float
+
+def _open_series(series):
+    """Array for a series, memory-mapping .npy paths"""
+    if isinstance(series, str):
+        return np.load(series, mmap_mode='r')
+    return np.asarray(series, dtype=float)
+
+class _ColumnWriter:
+    """Append column chunks to a Parquet (pyarrow) or CSV file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith('.parquet')
+        self._writer = None
+        self._file = None
+
+    def write(self, columns):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pydict(columns)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            if self._file is None:
+                self._file = open(self.path, 'w')
+                self._file.write(','.join(columns) + '\n')
+            np.savetxt(self._file, np.column_stack(list(columns.values())),
+                       delimiter=',', fmt='%.17g')
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._file is not None:
+            self._file.close()
+
+@instrument('generate_report', 'convert_batch', 'generate_report_batch')
 class GoldEnergyConverter:
     def __init__(self):
         # Conversion constants
@@ -39,7 +137,12 @@ class GoldEnergyConverter:
         energy_pj = self.convert_to_petajoules(energy_gj)
         years_of_energy = self.calculate_years_of_energy(energy_pj)
 
-        # Format report
+        return self.format_report(gold_reserves, gold_price, oil_price, troy_ounces,
+                                  gold_value, oil_barrels, energy_pj, years_of_energy)
+
+    def format_report(self, gold_reserves, gold_price, oil_price, troy_ounces,
+                      gold_value, oil_barrels, energy_pj, years_of_energy):
+        """Text report for one scenario's inputs and conversion results"""
         report = f"""
 Gold to Energy Conversion Report
 ==============================
@@ -64,6 +167,187 @@ Daily Energy Equivalent: {energy_pj / 365:,.2f} Petajoules/day
 """
         return report
 
+    def convert_batch(self, gold_reserves, gold_price, oil_price):
+        """
+        Vectorized generate_report calculations for many scenarios at once
+
+        The six conversion steps are folded into one reserves x price ratio
+        scaled by precomputed constant factors, so results can differ from
+        the scalar path in the last bits.
+
+        Parameters:
+        gold_reserves: Metric tons (array-like, broadcast against the prices)
+        gold_price: USD per troy ounce
+        oil_price: USD per barrel
+
+        Returns:
+        Dict of arrays: the inputs plus troy_ounces, gold_value, oil_barrels,
+        energy_pj and years_of_energy
+        """
+        gold_reserves, gold_price, oil_price = np.broadcast_arrays(
+            *(np.asarray(a, dtype=float) for a in (gold_reserves, gold_price, oil_price))
+        )
+        # Every result is this ratio (or the reserves) times a constant factor
+        tons_per_barrel_price = gold_reserves * gold_price / oil_price
+        barrels_factor = self.METRIC_TON_TO_TROY_OUNCES
+        energy_factor = barrels_factor * self.ENERGY_PER_BARREL_GJ / 1e6
+        troy_ounces = gold_reserves * self.METRIC_TON_TO_TROY_OUNCES
+        return {
+            'gold_reserves': gold_reserves,
+            'gold_price': gold_price,
+            'oil_price': oil_price,
+            'troy_ounces': troy_ounces,
+            'gold_value': troy_ounces * gold_price,
+            'oil_barrels': tons_per_barrel_price * barrels_factor,
+            'energy_pj': tons_per_barrel_price * energy_factor,
+            'years_of_energy': tons_per_barrel_price * (energy_factor / self.US_ANNUAL_ENERGY_PJ)
+        }
+
+    def generate_report_batch(self, source, output_path=None, chunk_size=100_000,
+                              report_rows=None) -> BatchReport:
+        """
+        Price many (reserves, gold_price, oil_price) scenarios in chunks
+
+        Parameters:
+        source: Dict or tuple of arrays in INPUT_COLUMNS order, or a path to a
+                CSV or Parquet file with those columns
+        output_path: Result file (.parquet via pyarrow, otherwise CSV); when
+                     omitted the result columns are returned in memory
+        chunk_size: Rows converted per chunk
+        report_rows: Row indices to render as text reports; nothing is
+                     formatted for other rows
+
+        Returns:
+        BatchReport
+        """
+        wanted = np.unique(np.asarray(report_rows if report_rows is not None else [], dtype=np.int64))
+        writer = _ColumnWriter(output_path) if output_path else None
+        chunks = []
+        reports = {}
+        start = 0
+        try:
+            for scenarios in _read_scenarios(source, chunk_size):
+                columns = self.convert_batch(*(scenarios[name] for name in INPUT_COLUMNS))
+                stop = start + len(columns['years_of_energy'])
+                for row in wanted[(wanted >= start) & (wanted < stop)]:
+                    reports[int(row)] = self.format_report(
+                        *(columns[name][row - start] for name in (
+                            'gold_reserves', 'gold_price', 'oil_price', 'troy_ounces',
+                            'gold_value', 'oil_barrels', 'energy_pj', 'years_of_energy'))
+                    )
+                if writer:
+                    writer.write(columns)
+                else:
+                    chunks.append(columns)
+                start = stop
+        finally:
+            if writer:
+                writer.close()
+
+        result = BatchReport(output_path=output_path, n_rows=start, reports=reports)
+        if not writer:
+            chunks = chunks or [self.convert_batch([], [], [])]
+            result.columns = {name: np.concatenate([c[name] for c in chunks]) for name in chunks[0]}
+        return result
+
+
+class EnergyBacktest:
+    """
+    Streaming "years of energy" backtest over gold and oil price ticks.
+
+    Each tick costs O(1): the rolling mean and variance over the last
+    `window` ticks are updated with a sliding Welford step, the rolling
+    extremes are kept in monotonic deques (amortized O(1)), and the
+    drawdown compares against the running peak. Nothing is recomputed
+    over the history.
+    """
+
+    def __init__(self, converter, gold_reserves, window=252):
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.window = window
+        self.us_annual_energy_pj = converter.US_ANNUAL_ENERGY_PJ
+        # Petajoules per (gold price / oil price) unit for these reserves
+        self.energy_factor = (gold_reserves * converter.METRIC_TON_TO_TROY_OUNCES
+                              * converter.ENERGY_PER_BARREL_GJ / 1e6)
+        self.tick = 0
+        self._values = deque()
+        self._mean = 0.0
+        self._m2 = 0.0
+        self._minima = deque()  # (tick, value), values increasing
+        self._maxima = deque()  # (tick, value), values decreasing
+        self.peak = -np.inf
+        self.max_drawdown = 0.0
+
+    def update(self, gold_price, oil_price, annual_energy_pj=None) -> BacktestSnapshot:
+        """Add one tick; annual_energy_pj defaults to the converter's constant"""
+        energy = self.us_annual_energy_pj if annual_energy_pj is None else annual_energy_pj
+        years = float(gold_price / oil_price * self.energy_factor / energy)
+
+        # Rolling mean and variance
+        self._values.append(years)
+        if len(self._values) > self.window:
+            old = self._values.popleft()
+            mean = self._mean + (years - old) / self.window
+            self._m2 += (years - old) * (years - mean + old - self._mean)
+        else:
+            mean = self._mean + (years - self._mean) / len(self._values)
+            self._m2 += (years - self._mean) * (years - mean)
+        self._mean = mean
+        n = len(self._values)
+        std = np.sqrt(max(self._m2, 0.0) / (n - 1)) if n > 1 else 0.0
+
+        # Rolling extremes
+        expired = self.tick - self.window
+        for extremes, keep in ((self._minima, lambda v: v < years), (self._maxima, lambda v: v > years)):
+            while extremes and not keep(extremes[-1][1]):
+                extremes.pop()
+            extremes.append((self.tick, years))
+            if extremes[0][0] <= expired:
+                extremes.popleft()
+
+        # Drawdown from the running peak
+        self.peak = max(self.peak, years)
+        drawdown = 1 - years / self.peak if self.peak > 0 else 0.0
+        self.max_drawdown = max(self.max_drawdown, drawdown)
+
+        snapshot = BacktestSnapshot(self.tick, years, mean, std, self._minima[0][1],
+                                    self._maxima[0][1], self.peak, drawdown, self.max_drawdown)
+        self.tick += 1
+        return snapshot
+
+    def run(self, gold_prices, oil_prices, annual_energy_pj=None, output_path=None):
+        """
+        Feed whole series through update
+
+        Parameters:
+        gold_prices, oil_prices: Arrays or .npy paths (memory-mapped) of equal length
+        annual_energy_pj: Consumption series (array or .npy path); None uses the constant
+        output_path: Optional .npy file for the results, written as a memory map
+
+        Returns:
+        Structured array of BACKTEST_DTYPE, one row per tick
+        """
+        gold_prices = _open_series(gold_prices)
+        oil_prices = _open_series(oil_prices)
+        energy = None if annual_energy_pj is None else _open_series(annual_energy_pj)
+        n = len(gold_prices)
+        if len(oil_prices) != n or (energy is not None and len(energy) != n):
+            raise ValueError("Price and consumption series must have the same length")
+
+        if output_path:
+            records = np.lib.format.open_memmap(output_path, mode='w+', dtype=BACKTEST_DTYPE, shape=(n,))
+        else:
+            records = np.empty(n, dtype=BACKTEST_DTYPE)
+        fields = BACKTEST_DTYPE.names
+        for i in range(n):
+            snapshot = self.update(float(gold_prices[i]), float(oil_prices[i]),
+                                   None if energy is None else float(energy[i]))
+            records[i] = tuple(getattr(snapshot, name) for name in fields)
+        if output_path:
+            records.flush()
+        return records
+
 def main():
     # Current values (as of 2024)
     US_GOLD_RESERVES = 8133.5  # metric tons
@@ -86,5 +370,29 @@ def main():
     )
     print(alternative_report)
 
+    # Batch of price scenarios; only the extremes are formatted as text
+    gold_prices = np.linspace(1800, 3000, 10_000)
+    oil_prices = np.linspace(60, 120, 10_000)
+    batch = converter.generate_report_batch((US_GOLD_RESERVES, gold_prices, oil_prices),
+                                            report_rows=[0, len(gold_prices) - 1])
+    years = batch.columns['years_of_energy']
+    print(f"\nBatch of {batch.n_rows} scenarios: "
+          f"{years.min():.2f} to {years.max():.2f} years of US energy consumption")
+    print(batch.reports[0])
+
+    # Backtest over a synthetic price history with slowly rising consumption
+    rng = np.random.default_rng(0)
+    days = 2000
+    gold_history = 1800 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+    oil_history = 80 * np.exp(np.cumsum(rng.normal(0, 0.02, days)))
+    consumption = np.linspace(95000, 99000, days)
+    backtest = EnergyBacktest(converter, US_GOLD_RESERVES, window=252)
+    records = backtest.run(gold_history, oil_history, consumption)
+    last = records[-1]
+    print(f"Backtest over {days} days: latest {last['years_of_energy']:.2f} years "
+          f"(252-day mean {last['rolling_mean']:.2f} ± {last['rolling_std']:.2f}, "
+          f"range {last['rolling_min']:.2f}-{last['rolling_max']:.2f}), "
+          f"max drawdown {last['max_drawdown']:.1%}")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,212 @@
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+import numpy as np
+
+# Set CALC_INSTRUMENT=1 to record calculator calls from import time on
+ENABLED = os.environ.get('CALC_INSTRUMENT', '0') not in ('', '0', 'false', 'no')
+
+# Histogram upper bounds: seconds for wall/CPU time, elements for array sizes
+TIME_BUCKETS = (1e-5, 1e-4, 1e-3, 1e-2, 0.1, 1.0, 10.0, float('inf'))
+SIZE_BUCKETS = (1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, float('inf'))
+
+# Methods registered by instrument(): (owner class, attribute, original descriptor)
+_targets = []
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[next(i for i, bound in enumerate(self.bounds) if value <= bound)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        return list(itertools.accumulate(self.counts))
+
+
+class MethodStats:
+    """Calls, wall/CPU time and input array sizes of one instrumented method"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.wall_seconds = Histogram(TIME_BUCKETS)
+        self.cpu_seconds = Histogram(TIME_BUCKETS)
+        self.array_elements = Histogram(SIZE_BUCKETS)
+
+
+class Registry:
+    """In-process store of MethodStats, keyed by 'Class.method'"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def record(self, name, wall, cpu, elements, failed):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = MethodStats()
+            stats.calls += 1
+            stats.errors += failed
+            stats.wall_seconds.observe(wall)
+            stats.cpu_seconds.observe(cpu)
+            stats.array_elements.observe(elements)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def snapshot(self):
+        """Plain-dict copy of every method's statistics"""
+        with self._lock:
+            return {
+                name: {
+                    'calls': stats.calls,
+                    'errors': stats.errors,
+                    **{
+                        metric: {
+                            'buckets': dict(zip(map(str, hist.bounds), hist.cumulative())),
+                            'sum': hist.sum,
+                            'count': hist.count
+                        }
+                        for metric, hist in (('wall_seconds', stats.wall_seconds),
+                                             ('cpu_seconds', stats.cpu_seconds),
+                                             ('array_elements', stats.array_elements))
+                    }
+                }
+                for name, stats in self._stats.items()
+            }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix='calculator'):
+        """Registry in the Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+        for counter, help_text in (('calls', 'Instrumented method calls'),
+                                   ('errors', 'Instrumented method calls that raised')):
+            lines += [f'# HELP {prefix}_{counter}_total {help_text}',
+                      f'# TYPE {prefix}_{counter}_total counter']
+            lines += [f'{prefix}_{counter}_total{{method="{name}"}} {stats[counter]}'
+                      for name, stats in snapshot.items()]
+        for metric, help_text in (('wall_seconds', 'Wall-clock time per call'),
+                                  ('cpu_seconds', 'Process CPU time per call'),
+                                  ('array_elements', 'Array elements passed per call')):
+            lines += [f'# HELP {prefix}_{metric} {help_text}', f'# TYPE {prefix}_{metric} histogram']
+            for name, stats in snapshot.items():
+                hist = stats[metric]
+                for bound, count in hist['buckets'].items():
+                    le = '+Inf' if bound == 'inf' else bound
+                    lines.append(f'{prefix}_{metric}_bucket{{method="{name}",le="{le}"}} {count}')
+                lines.append(f'{prefix}_{metric}_sum{{method="{name}"}} {hist["sum"]}')
+                lines.append(f'{prefix}_{metric}_count{{method="{name}"}} {hist["count"]}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = Registry()
+
+
+_CONTAINERS = (np.ndarray, list, tuple, dict)
+
+
+def _elements(value):
+    """Elements in an array, or in a (possibly ragged) list, tuple or dict of them"""
+    if isinstance(value, np.ndarray):
+        return value.size
+    if isinstance(value, dict):
+        value = value.values()
+    elif not isinstance(value, (list, tuple)):
+        return 1
+    elif not any(isinstance(item, _CONTAINERS) for item in value):
+        return len(value)  # Flat list of scalars
+    return sum(_elements(item) for item in value)
+
+
+def _array_elements(args, kwargs):
+    """Total elements of the array arguments of a call (scalars count as none)"""
+    return sum(_elements(value) for value in (*args, *kwargs.values())
+               if isinstance(value, _CONTAINERS))
+
+
+def _wrap(function, name):
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        wall, cpu = time.perf_counter(), time.process_time()
+        failed = True
+        try:
+            result = function(*args, **kwargs)
+            failed = False
+            return result
+        finally:
+            registry.record(name, time.perf_counter() - wall, time.process_time() - cpu,
+                            _array_elements(args, kwargs), failed)
+    return wrapper
+
+
+@contextmanager
+def timed(name, *arrays):
+    """Record a block of code under `name` like an instrumented call; no-op while disabled"""
+    if not ENABLED:
+        yield
+        return
+    wall, cpu = time.perf_counter(), time.process_time()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        registry.record(name, time.perf_counter() - wall, time.process_time() - cpu,
+                        _array_elements(arrays, {}), failed)
+
+
+def _wrap_descriptor(descriptor, name):
+    """Instrumented copy of a plain, static or class method"""
+    if isinstance(descriptor, (staticmethod, classmethod)):
+        return type(descriptor)(_wrap(descriptor.__func__, name))
+    return _wrap(descriptor, name)
+
+
+def instrument(*method_names):
+    """
+    Class decorator registering public calculation methods for instrumentation
+
+    While instrumentation is disabled the class is returned untouched, so
+    calls cost nothing extra; enable() swaps in recording wrappers later.
+    """
+    def register(cls):
+        for method in method_names:
+            _targets.append((cls, method, cls.__dict__[method]))
+            if ENABLED:
+                setattr(cls, method, _wrap_descriptor(cls.__dict__[method], f'{cls.__name__}.{method}'))
+        return cls
+    return register
+
+
+def enable():
+    """Swap recording wrappers into every registered method"""
+    global ENABLED
+    ENABLED = True
+    for cls, method, original in _targets:
+        setattr(cls, method, _wrap_descriptor(original, f'{cls.__name__}.{method}'))
+
+
+def disable():
+    """Restore the original methods; recorded statistics are kept"""
+    global ENABLED
+    ENABLED = False
+    for cls, method, original in _targets:
+        setattr(cls, method, original)
@@ -1,8 +1,149 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from PlotRenderer import figure, finish, plot_line
+from Instrumentation import instrument
+from SolverCache import LRUCache
 
+# Distinct step sizes whose matrix exponentials DecayChain keeps
+PROPAGATOR_CACHE_SIZE = 64
+
+
+class DecayChain:
+    """
+    Coupled parent/daughter decay (Bateman equations) on a nuclide graph.
+
+    The populations obey dN/dt = A N, where A is a sparse matrix holding
+    -λ on the diagonal and branching_ratio * λ_parent for each
+    parent -> daughter edge. Daughters without a half-life are treated as
+    stable.
+    """
+
+    def __init__(self, half_lives, branches):
+        """
+        Parameters:
+        half_lives: Mapping nuclide -> half-life in hours (np.inf for stable)
+        branches: Mapping parent -> list of (daughter, branching_ratio)
+        """
+        self.nuclides = list(half_lives)
+        for daughters in branches.values():
+            for daughter, _ in daughters:
+                if daughter not in self.nuclides:
+                    self.nuclides.append(daughter)
+        self.index = {name: i for i, name in enumerate(self.nuclides)}
+
+        half_life = np.array([half_lives.get(name, np.inf) for name in self.nuclides], dtype=float)
+        self.decay_constants = np.log(2) / half_life
+
+        from scipy import sparse
+
+        n = len(self.nuclides)
+        rows = list(range(n))
+        cols = list(range(n))
+        values = list(-self.decay_constants)
+        for parent, daughters in branches.items():
+            p = self.index[parent]
+            for daughter, ratio in daughters:
+                rows.append(self.index[daughter])
+                cols.append(p)
+                values.append(ratio * self.decay_constants[p])
+        self.matrix = sparse.csr_matrix((values, (rows, cols)), shape=(n, n))
+
+        self._eigen = None
+        self._propagators = LRUCache(maxsize=PROPAGATOR_CACHE_SIZE)
+
+    @classmethod
+    def from_store(cls, store):
+        """Build the chain directly from the columns of a NuclideDataStore"""
+        from scipy import sparse
+
+        chain = cls.__new__(cls)
+        chain.nuclides = store.column('nuclides', 'name').tolist()
+        chain.index = store.index('nuclides')
+        chain.decay_constants = np.log(2) / np.asarray(store.column('nuclides', 'half_life_hours'))
+
+        n = len(chain.nuclides)
+        branches = store.table('branches')
+        parents = np.asarray(branches['parent'])
+        rows = np.concatenate([np.arange(n), branches['daughter']])
+        cols = np.concatenate([np.arange(n), parents])
+        values = np.concatenate([-chain.decay_constants,
+                                 branches['ratio'] * chain.decay_constants[parents]])
+        chain.matrix = sparse.csr_matrix((values, (rows, cols)), shape=(n, n))
+
+        chain._eigen = None
+        chain._propagators = LRUCache(maxsize=PROPAGATOR_CACHE_SIZE)
+        return chain
+
+    def _eigendecomposition(self):
+        """
+        Cached A = V diag(w) V⁻¹, or False when A is not safely diagonalizable
+        (e.g. a parent and daughter with equal half-lives)
+        """
+        if self._eigen is None:
+            w, v = np.linalg.eig(self.matrix.toarray())
+            w, v = w.real, v.real
+            if np.linalg.cond(v) > 1e10:
+                self._eigen = False
+            else:
+                self._eigen = (w, v, np.linalg.inv(v))
+        return self._eigen
+
+    def _propagator(self, dt):
+        """Cached matrix exponential exp(A dt), reused across time grids"""
+        from scipy.linalg import expm
+        return self._propagators.get(round(float(dt), 12),
+                                     lambda: expm(self.matrix.toarray() * dt))
+
+    def populations(self, initial_amounts, time_hours):
+        """
+        Populations of every nuclide at many time points in one call
+
+        Parameters:
+        initial_amounts: Array (n_nuclides,) or (n_chains, n_nuclides) of
+                         initial amounts, in the order of self.nuclides
+        time_hours: 1-D array of time points
+
+        Returns:
+        Array (n_nuclides, n_times) or (n_chains, n_nuclides, n_times)
+        """
+        initial = np.asarray(initial_amounts, dtype=float)
+        times = np.atleast_1d(np.asarray(time_hours, dtype=float))
+        batch = np.atleast_2d(initial)
+
+        eigen = self._eigendecomposition()
+        if eigen:
+            w, v, v_inv = eigen
+            coefficients = batch @ v_inv.T                  # (chains, n)
+            modes = np.exp(np.outer(w, times))              # (n, T)
+            result = np.einsum('ij,cj,jt->cit', v, coefficients, modes, optimize=True)
+        else:
+            # Step between sorted time points; uniform grids reuse one propagator
+            order = np.argsort(times)
+            result = np.empty((batch.shape[0], batch.shape[1], len(times)))
+            state = batch.T
+            previous = 0.0
+            for k in order:
+                state = self._propagator(times[k] - previous) @ state
+                result[:, :, k] = state.T
+                previous = times[k]
+
+        # Clip round-off below zero (e.g. an empty daughter at t = 0)
+        np.maximum(result, 0.0, out=result)
+        return result[0] if initial.ndim == 1 else result
+
+
+@instrument('calculate_decay', 'build_decay_chain', 'calculate_chain_decay',
+            'calculate_activity_time')
 class IsotopeDecayCalculator:
-    def __init__(self):
+    def __init__(self, data_store=None, cache=None):
+        self.data_store = data_store
+        # Optional SolverCache.LRUCache or SharedMemoryCache for calculate_activity_time
+        self.cache = cache
+        if data_store is not None:
+            # Full nuclide tables memory-mapped from a NuclideDataStore
+            self.medical_isotopes = data_store.half_lives()
+            self.decay_chains = data_store.decay_branches()
+            return
+
         # Common medical isotopes with half-lives in hours
         self.medical_isotopes = {
             "Tc-99m": 6.0,      # Used in medical imaging
@@ -12,12 +153,18 @@ class IsotopeDecayCalculator:
             "Mo-99": 66.0       # Used as Tc-99m generator
         }
 
+        # Parent -> [(daughter, branching ratio)]; Tc-99 is effectively stable
+        self.decay_chains = {
+            "Mo-99": [("Tc-99m", 0.876), ("Tc-99", 0.124)],
+            "Tc-99m": [("Tc-99", 1.0)]
+        }
+
     def calculate_decay(self, initial_amount, half_life_hours, time_hours):
         """Calculate remaining amount after decay"""
         decay_constant = np.log(2) / half_life_hours
         return initial_amount * np.exp(-decay_constant * time_hours)
 
-    def plot_decay_curve(self, isotope_name, initial_amount, duration_hours):
+    def plot_decay_curve(self, isotope_name, initial_amount, duration_hours, output_path=None):
         """Plot decay curve for a specific isotope"""
         if isotope_name not in self.medical_isotopes:
             raise ValueError(f"Unknown isotope: {isotope_name}")
@@ -26,59 +173,103 @@ class IsotopeDecayCalculator:
         times = np.linspace(0, duration_hours, 1000)
         amounts = self.calculate_decay(initial_amount, half_life, times)
 
-        plt.figure(figsize=(10, 6))
-        plt.plot(times, amounts)
-        plt.title(f'Decay Curve for {isotope_name} (Half-life: {half_life} hours)')
-        plt.xlabel('Time (hours)')
-        plt.ylabel('Remaining Amount (arbitrary units)')
-        plt.grid(True)
+        fig, ax = figure('decay_curve', figsize=(10, 6))
+        plot_line(ax, times, amounts)
+        ax.set_title(f'Decay Curve for {isotope_name} (Half-life: {half_life} hours)')
+        ax.set_xlabel('Time (hours)')
+        ax.set_ylabel('Remaining Amount (arbitrary units)')
+        ax.grid(True)
         
         # Add half-life markers
-        plt.axhline(y=initial_amount/2, color='r', linestyle='--', alpha=0.3)
-        plt.axvline(x=half_life, color='r', linestyle='--', alpha=0.3)
+        ax.axhline(y=initial_amount/2, color='r', linestyle='--', alpha=0.3)
+        ax.axvline(x=half_life, color='r', linestyle='--', alpha=0.3)
         
         # Add annotation for half-life
-        plt.annotate(f'Half-life: {half_life} hours', 
+        ax.annotate(f'Half-life: {half_life} hours', 
                     xy=(half_life, initial_amount/2),
                     xytext=(half_life+duration_hours/10, initial_amount/2),
                     arrowprops=dict(facecolor='red', shrink=0.05))
         
-        plt.show()
+        return finish(fig, output_path)
 
-    def compare_isotopes(self, initial_amount=1000, duration_hours=24):
+    def compare_isotopes(self, initial_amount=1000, duration_hours=24, output_path=None):
         """Compare decay rates of different medical isotopes"""
-        plt.figure(figsize=(12, 8))
+        fig, ax = figure('compare_isotopes', figsize=(12, 8))
         
         for isotope, half_life in self.medical_isotopes.items():
             times = np.linspace(0, duration_hours, 1000)
             amounts = self.calculate_decay(initial_amount, half_life, times)
-            plt.plot(times, amounts, label=f'{isotope} (t½={half_life}h)')
+            plot_line(ax, times, amounts, label=f'{isotope} (t½={half_life}h)')
+
+        ax.set_title('Comparison of Medical Isotope Decay Rates')
+        ax.set_xlabel('Time (hours)')
+        ax.set_ylabel('Remaining Amount (arbitrary units)')
+        ax.legend()
+        ax.grid(True)
+        ax.set_yscale('log')
+        return finish(fig, output_path)
+
+    def build_decay_chain(self):
+        """Decay chain over all known isotopes, rebuilt only when they change"""
+        if self.data_store is not None and \
+                getattr(self.medical_isotopes, 'store', None) is self.data_store and \
+                getattr(self.decay_chains, 'store', None) is self.data_store:
+            signature = self.data_store
+        else:
+            signature = (tuple(self.medical_isotopes.items()),
+                         tuple((p, tuple(d)) for p, d in self.decay_chains.items()))
+        if getattr(self, '_chain_signature', None) != signature:
+            if signature is self.data_store:
+                self._chain = DecayChain.from_store(self.data_store)
+            else:
+                self._chain = DecayChain(self.medical_isotopes, self.decay_chains)
+            self._chain_signature = signature
+        return self._chain
+
+    def calculate_chain_decay(self, initial_amounts, time_hours):
+        """
+        Calculate parent and daughter amounts over time for coupled chains
+        such as the Mo-99 -> Tc-99m generator
 
-        plt.title('Comparison of Medical Isotope Decay Rates')
-        plt.xlabel('Time (hours)')
-        plt.ylabel('Remaining Amount (arbitrary units)')
-        plt.legend()
-        plt.grid(True)
-        plt.yscale('log')
-        plt.show()
+        Parameters:
+        initial_amounts: Dict of isotope name -> initial amount
+        time_hours: Time points in hours
+
+        Returns:
+        Dict of isotope name -> amounts at each time point
+        """
+        chain = self.build_decay_chain()
+        initial = np.zeros(len(chain.nuclides))
+        for name, amount in initial_amounts.items():
+            initial[chain.index[name]] = amount
+        populations = chain.populations(initial, time_hours)
+        return dict(zip(chain.nuclides, populations))
 
     def calculate_activity_time(self, isotope_name, initial_amount, target_fraction):
         """Calculate time needed to reach a target fraction of initial amount"""
         half_life = self.medical_isotopes[isotope_name]
-        decay_constant = np.log(2) / half_life
-        time = -np.log(target_fraction) / decay_constant
-        return time
+
+        def solve():
+            decay_constant = np.log(2) / half_life
+            time = -np.log(target_fraction) / decay_constant
+            return time
+        if self.cache is None:
+            return solve()
+        # The half-life is part of the key, so edited isotopes miss the cache
+        return self.cache.get(('activity_time', isotope_name, half_life, float(target_fraction)), solve)
 
 def main():
     calc = IsotopeDecayCalculator()
     
     # Example 1: Plot decay curve for Tc-99m
     print("Analyzing Tc-99m decay (common medical imaging isotope)")
-    calc.plot_decay_curve("Tc-99m", 1000, 24)
+    path = calc.plot_decay_curve("Tc-99m", 1000, 24, output_path="tc99m_decay.png")
+    print(f"Decay curve saved to {path}")
     
     # Example 2: Compare different medical isotopes
     print("\nComparing decay rates of different medical isotopes")
-    calc.compare_isotopes()
+    path = calc.compare_isotopes(output_path="isotope_comparison.png")
+    print(f"Comparison saved to {path}")
     
     # Example 3: Calculate specific decay times
     print("\nTime to reach specific activity levels for Tc-99m:")
@@ -87,5 +278,12 @@ def main():
         time = calc.calculate_activity_time("Tc-99m", initial, fraction)
         print(f"Time to reach {fraction*100}% activity: {time:.2f} hours")
 
+    # Example 4: Mo-99 -> Tc-99m generator ingrowth
+    print("\nTc-99m ingrowth in a Mo-99 generator:")
+    times = np.array([0, 6, 12, 24, 48])
+    amounts = calc.calculate_chain_decay({"Mo-99": 1000}, times)
+    for t, mo, tc in zip(times, amounts["Mo-99"], amounts["Tc-99m"]):
+        print(f"t = {t:>2} h: Mo-99 {mo:8.2f}, Tc-99m {tc:8.2f}")
+
 if __name__ == "__main__":
     main()
@@ -1,6 +1,14 @@
 import numpy as np
 from dataclasses import dataclass
-import matplotlib.pyplot as plt
+from typing import Tuple
+from PlotRenderer import figure, finish, plot_line
+from Instrumentation import instrument
+
+# Phase codes of WaterHeatingResult.phase
+PHASE_LIQUID = 0
+PHASE_MIXED = 1
+PHASE_STEAM = 2
+PHASE_NAMES = ('liquid', 'mixed', 'superheated_steam')
 
 @dataclass
 class WaterProperties:
@@ -8,56 +16,220 @@ class WaterProperties:
     latent_heat_vaporization: float = 2260  # kJ/kg
     initial_temperature: float = 20  # °C
     boiling_point: float = 100  # °C
+    steam_specific_heat: float = 2.08  # kJ/kg·K
+    # Optional liquid cp(T) = c0 + c1*T + c2*T² + ... in kJ/kg·K (T in °C);
+    # when empty the constant specific_heat is used
+    specific_heat_coefficients: Tuple[float, ...] = ()
+
+@dataclass
+class WaterHeatingResult:
+    """Struct-of-arrays result of calculate_water_temperature_rise_batch"""
+    final_temperature: np.ndarray  # °C
+    phase: np.ndarray  # int8 phase codes (PHASE_LIQUID, PHASE_MIXED, PHASE_STEAM)
+    vapor_fraction: np.ndarray  # 0 for liquid, 1 for superheated steam
+    energy_absorbed: np.ndarray  # kJ
 
+@dataclass
+class HeatingSnapshot:
+    """State of all cells at one time of simulate_heating"""
+    time: float  # s
+    state: WaterHeatingResult
+    boiling_onset: np.ndarray  # s; NaN until the cell reaches the boiling point
+    dryout: np.ndarray  # s; NaN until the cell is fully vaporized
+
+@instrument('calculate_water_temperature_rise_batch', 'calculate_water_temperature_rise',
+            'calculate_radiation_shielding', 'decay_curve')
 class NuclearPhysicsCalculator:
     def __init__(self):
         self.water = WaterProperties()
-        
+
+    def _liquid_heat(self, temperature):
+        """Heat (kJ/kg) to warm liquid water from the initial temperature"""
+        w = self.water
+        if not w.specific_heat_coefficients:
+            return w.specific_heat * (temperature - w.initial_temperature)
+        # Antiderivative of the cp(T) polynomial
+        antiderivative = np.polyint(np.asarray(w.specific_heat_coefficients)[::-1])
+        return np.polyval(antiderivative, temperature) - \
+            np.polyval(antiderivative, w.initial_temperature)
+
+    def _liquid_temperature(self, heat, tol=1e-10, max_iter=50):
+        """Temperature of liquid water after absorbing `heat` kJ/kg (inverse of _liquid_heat)"""
+        w = self.water
+        if not w.specific_heat_coefficients:
+            return w.initial_temperature + heat / w.specific_heat
+
+        cp = np.asarray(w.specific_heat_coefficients)[::-1]
+        temperature = w.initial_temperature + heat / np.polyval(cp, w.initial_temperature)
+        for _ in range(max_iter):
+            step = (self._liquid_heat(temperature) - heat) / np.polyval(cp, temperature)
+            temperature = temperature - step
+            if np.all(np.abs(step) <= tol * np.maximum(np.abs(temperature), 1.0)):
+                break
+        return temperature
+
+    def phase_boundaries(self, mass_kg):
+        """Energy (kJ) needed to reach boiling and, beyond that, to vaporize"""
+        w = self.water
+        energy_to_boiling = mass_kg * self._liquid_heat(w.boiling_point)
+        energy_to_vaporize = mass_kg * w.latent_heat_vaporization
+        return energy_to_boiling, energy_to_vaporize
+
+    def calculate_water_temperature_rise_batch(self, energy_joules, mass_kg):
+        """
+        Final state of water for many (energy, mass) pairs at once
+
+        The liquid, mixed and superheated-steam regimes are evaluated with
+        masked array operations.
+
+        Parameters:
+        energy_joules: Absorbed energies in joules (array-like)
+        mass_kg: Water masses in kg (array-like, broadcast against energy)
+
+        Returns:
+        WaterHeatingResult
+        """
+        # Convert joules to kilojoules
+        energy_kj, mass = np.broadcast_arrays(
+            np.asarray(energy_joules, dtype=float) / 1000, np.asarray(mass_kg, dtype=float)
+        )
+        energy_to_boiling, energy_to_vaporize = self.phase_boundaries(mass)
+        remaining = energy_kj - energy_to_boiling
+
+        liquid = energy_kj < energy_to_boiling
+        steam = ~liquid & (remaining >= energy_to_vaporize)
+        mixed = ~liquid & ~steam
+
+        phase = np.full(energy_kj.shape, PHASE_MIXED, dtype=np.int8)
+        phase[liquid] = PHASE_LIQUID
+        phase[steam] = PHASE_STEAM
+
+        temperature = np.full(energy_kj.shape, float(self.water.boiling_point))
+        temperature[liquid] = self._liquid_temperature(energy_kj[liquid] / mass[liquid])
+        temperature[steam] = self.water.boiling_point + \
+            (remaining[steam] - energy_to_vaporize[steam]) / \
+            (mass[steam] * self.water.steam_specific_heat)
+
+        vapor_fraction = np.zeros(energy_kj.shape)
+        vapor_fraction[mixed] = remaining[mixed] / energy_to_vaporize[mixed]
+        vapor_fraction[steam] = 1.0
+
+        return WaterHeatingResult(temperature, phase, vapor_fraction, energy_kj)
+
     def calculate_water_temperature_rise(self, energy_joules, mass_kg):
         """
         Calculate temperature rise in water from energy absorption
         Returns: final temp and state changes
         """
-        # Convert joules to kilojoules
-        energy_kj = energy_joules / 1000
-        
-        # Energy needed to reach boiling
-        energy_to_boiling = mass_kg * self.water.specific_heat * \
-            (self.water.boiling_point - self.water.initial_temperature)
-        
-        # If not enough energy to reach boiling
-        if energy_kj < energy_to_boiling:
-            delta_t = energy_kj / (mass_kg * self.water.specific_heat)
-            final_temp = self.water.initial_temperature + delta_t
-            return {
-                'final_temperature': final_temp,
-                'phase': 'liquid',
-                'energy_absorbed': energy_kj
-            }
-        
-        # Energy needed to vaporize
-        energy_to_vaporize = mass_kg * self.water.latent_heat_vaporization
-        remaining_energy = energy_kj - energy_to_boiling
-        
-        # If water vaporizes
-        if remaining_energy >= energy_to_vaporize:
-            # Calculate superheated steam temperature
-            remaining_energy = remaining_energy - energy_to_vaporize
-            delta_t_steam = remaining_energy / (mass_kg * 2.08)  # Steam specific heat
-            final_temp = self.water.boiling_point + delta_t_steam
-            return {
-                'final_temperature': final_temp,
-                'phase': 'superheated_steam',
-                'energy_absorbed': energy_kj
-            }
-        
-        # Partially vaporized
-        return {
-            'final_temperature': self.water.boiling_point,
-            'phase': 'mixed',
-            'vapor_fraction': remaining_energy / energy_to_vaporize,
-            'energy_absorbed': energy_kj
+        result = self.calculate_water_temperature_rise_batch(energy_joules, mass_kg)
+        state = {
+            'final_temperature': result.final_temperature[()],
+            'phase': PHASE_NAMES[result.phase[()]],
+            'energy_absorbed': result.energy_absorbed[()]
         }
+        if result.phase[()] == PHASE_MIXED:
+            state['vapor_fraction'] = result.vapor_fraction[()]
+        return state
+
+    def simulate_heating(self, mass_kg, initial_power_watts, half_life_seconds, duration_seconds,
+                         heat_loss_w_per_k=0.0, output_times=None, initial_step=1.0,
+                         max_step=None, atol_kj=1e-2, rtol=1e-4):
+        """
+        Time history of water cells heated by a decaying source
+
+        Every cell absorbs power P(t) = decay_curve(P₀, half_life, t) and
+        optionally loses h * (T - T_initial) to its surroundings. All cells
+        are advanced together on the absorbed-energy (enthalpy) variable, so
+        latent-heat plateaus need no special treatment. The source term is
+        integrated exactly over each step; the loss term uses Heun's method
+        and its difference from the Euler predictor sets the adaptive step.
+        The times at which each cell starts boiling and dries out are
+        interpolated within the step.
+
+        Parameters:
+        mass_kg: Water mass per cell (array-like)
+        initial_power_watts: Source power per cell at t = 0 (array-like)
+        half_life_seconds: Half-life of the source
+        duration_seconds: End time of the simulation
+        heat_loss_w_per_k: Heat-loss coefficient per cell (array-like)
+        output_times: Times to report; default reports every accepted step
+        initial_step, max_step: Step-size bounds in seconds
+        atol_kj, rtol: Absolute and relative tolerance on the local error of
+                       the absorbed energy per step
+
+        Yields:
+        HeatingSnapshot at each reported time
+        """
+        mass, power, loss = (np.array(a, dtype=float) for a in np.broadcast_arrays(
+            mass_kg, initial_power_watts, heat_loss_w_per_k))
+        decay_constant = np.log(2) / half_life_seconds
+        energy_to_boiling, energy_to_vaporize = self.phase_boundaries(mass)
+        energy_to_dryout = energy_to_boiling + energy_to_vaporize
+        max_step = duration_seconds if max_step is None else max_step
+        has_loss = np.any(loss)
+
+        if output_times is None:
+            pending = None
+        else:
+            pending = list(np.sort(np.asarray(output_times, dtype=float)))
+
+        def loss_kw(energy):
+            if not has_loss:
+                return 0.0
+            temperature = self.calculate_water_temperature_rise_batch(energy * 1000, mass).final_temperature
+            return loss * (temperature - self.water.initial_temperature) / 1000
+
+        def snapshot(t, energy):
+            return HeatingSnapshot(
+                t, self.calculate_water_temperature_rise_batch(energy * 1000, mass),
+                boiling_onset.copy(), dryout.copy()
+            )
+
+        energy = np.zeros(mass.shape)  # kJ absorbed per cell
+        boiling_onset = np.full(mass.shape, np.nan)
+        dryout = np.full(mass.shape, np.nan)
+        t = 0.0
+        dt = min(initial_step, max_step)
+
+        if pending is None or (pending and pending[0] <= 0):
+            yield snapshot(t, energy)
+            if pending:
+                pending.pop(0)
+
+        while t < duration_seconds:
+            dt = min(dt, duration_seconds - t)
+            if pending:
+                dt = min(dt, pending[0] - t)
+
+            # Exact source energy over the step: ∫ P₀ e^(-λs) ds
+            source = power / decay_constant * \
+                (np.exp(-decay_constant * t) - np.exp(-decay_constant * (t + dt))) / 1000
+            loss_start = loss_kw(energy)
+            predicted = energy + source - loss_start * dt
+            corrected = energy + source - 0.5 * (loss_start + loss_kw(predicted)) * dt
+
+            error = np.max(np.abs(corrected - predicted) / (atol_kj + rtol * np.abs(corrected))) \
+                if has_loss else 0.0
+            if error > 1.0 and dt > 1e-9:
+                dt *= max(0.2, 0.9 * np.sqrt(1.0 / error))
+                continue
+
+            # Interpolate phase-boundary crossings within the step
+            for boundary, times in ((energy_to_boiling, boiling_onset), (energy_to_dryout, dryout)):
+                crossed = np.isnan(times) & (energy < boundary) & (corrected >= boundary)
+                fraction = (boundary[crossed] - energy[crossed]) / (corrected[crossed] - energy[crossed])
+                times[crossed] = t + fraction * dt
+
+            energy = corrected
+            t += dt
+            if pending is None:
+                yield snapshot(t, energy)
+            elif pending and np.isclose(t, pending[0]):
+                pending.pop(0)
+                yield snapshot(t, energy)
+
+            growth = 2.0 if error == 0 else min(2.0, 0.9 * np.sqrt(1.0 / error))
+            dt = min(dt * growth, max_step)
 
     @staticmethod
     def calculate_radiation_shielding(initial_intensity, material_thickness, attenuation_coeff):
@@ -77,16 +249,24 @@ def main():
     print("Water Heating Analysis")
     print("=====================")
     
-    test_energies = [1e6, 1e7, 1e8]  # Joules
+    test_energies = np.array([1e6, 1e7, 1e8])  # Joules
     mass = 1.0  # kg
     
-    for energy in test_energies:
-        result = calc.calculate_water_temperature_rise(energy, mass)
+    result = calc.calculate_water_temperature_rise_batch(test_energies, mass)
+    for energy, temperature, phase, vapor_fraction in zip(
+            test_energies, result.final_temperature, result.phase, result.vapor_fraction):
         print(f"\nEnergy Input: {energy/1e6:.2f} MJ")
-        print(f"Final Temperature: {result['final_temperature']:.2f}°C")
-        print(f"Phase: {result['phase']}")
-        if 'vapor_fraction' in result:
-            print(f"Vapor Fraction: {result['vapor_fraction']:.2%}")
+        print(f"Final Temperature: {temperature:.2f}°C")
+        print(f"Phase: {PHASE_NAMES[phase]}")
+        if phase == PHASE_MIXED:
+            print(f"Vapor Fraction: {vapor_fraction:.2%}")
+    
+    # Transient: 1, 2 and 5 kg cells under a 2 kW source with a 1 h half-life
+    print("\nTransient Heating (2 kW source, 1 h half-life)")
+    for snap in calc.simulate_heating([1.0, 2.0, 5.0], 2000.0, 3600.0, 4 * 3600.0,
+                                      heat_loss_w_per_k=1.0, output_times=[600, 1800, 3600, 14400]):
+        temperatures = ", ".join(f"{T:.1f}°C" for T in snap.state.final_temperature)
+        print(f"t = {snap.time / 60:>5.0f} min: {temperatures}")
     
     # Example 2: Radiation Shielding
     print("\nRadiation Shielding Analysis")
@@ -97,14 +277,14 @@ def main():
         calc.calculate_radiation_shielding(1000, d, 0.02) for d in distances
     ]
     
-    plt.figure(figsize=(10, 6))
-    plt.plot(distances, intensities)
-    plt.title('Radiation Intensity vs. Shielding Thickness')
-    plt.xlabel('Shield Thickness (cm)')
-    plt.ylabel('Radiation Intensity')
-    plt.yscale('log')
-    plt.grid(True)
-    plt.show()
+    fig, ax = figure('shielding', figsize=(10, 6))
+    plot_line(ax, distances, intensities)
+    ax.set_title('Radiation Intensity vs. Shielding Thickness')
+    ax.set_xlabel('Shield Thickness (cm)')
+    ax.set_ylabel('Radiation Intensity')
+    ax.set_yscale('log')
+    ax.grid(True)
+    print(f"Shielding curve saved to {finish(fig, 'shielding_curve.png')}")
     
     # Example 3: Isotope Decay
     print("\nIsotope Decay Analysis")
@@ -113,13 +293,13 @@ def main():
     time_points = np.linspace(0, 10, 100)
     amount = calc.decay_curve(1000, 2, time_points)
     
-    plt.figure(figsize=(10, 6))
-    plt.plot(time_points, amount)
-    plt.title('Radioactive Decay')
-    plt.xlabel('Time (half-lives)')
-    plt.ylabel('Amount Remaining')
-    plt.grid(True)
-    plt.show()
+    fig, ax = figure('decay', figsize=(10, 6))
+    plot_line(ax, time_points, amount)
+    ax.set_title('Radioactive Decay')
+    ax.set_xlabel('Time (half-lives)')
+    ax.set_ylabel('Amount Remaining')
+    ax.grid(True)
+    print(f"Decay curve saved to {finish(fig, 'decay_curve.png')}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,248 @@
+import os
+import numpy as np
+from collections.abc import Mapping
+from RadiationShield import Material
+
+# On-disk record layouts; each table is a structured .npy file in the store directory
+NUCLIDE_DTYPE = np.dtype([
+    ('name', 'U16'),
+    ('half_life_hours', 'f8')      # np.inf for stable nuclides
+])
+BRANCH_DTYPE = np.dtype([
+    ('parent', 'i4'),              # Row in the nuclide table
+    ('daughter', 'i4'),            # Row in the nuclide table
+    ('ratio', 'f8')                # Branching ratio
+])
+MATERIAL_DTYPE = np.dtype([
+    ('key', 'U16'),
+    ('name', 'U32'),
+    ('density', 'f8'),                  # g/cm³
+    ('attenuation_coefficient', 'f8'),  # cm²/g
+    ('cost_per_cm3', 'f8')              # dollars per cm³
+])
+ATTENUATION_DTYPE = np.dtype([
+    ('material', 'i4'),            # Row in the material table; rows grouped by material
+    ('energy_mev', 'f8'),
+    ('mass_attenuation', 'f8')     # μ/ρ in cm²/g
+])
+
+TABLES = {
+    'nuclides': NUCLIDE_DTYPE,
+    'branches': BRANCH_DTYPE,
+    'materials': MATERIAL_DTYPE,
+    'attenuation': ATTENUATION_DTYPE
+}
+
+# Stores opened in this process, keyed by absolute path
+_open_stores = {}
+
+
+def write_store(path, half_lives=None, branches=None, materials=None):
+    """
+    Write nuclide and material tables to a store directory
+
+    Parameters:
+    path: Store directory (created if missing)
+    half_lives: Mapping nuclide -> half-life in hours
+    branches: Mapping parent -> list of (daughter, branching_ratio);
+              daughters missing from half_lives are stored as stable
+    materials: Mapping key -> Material; μ/ρ(E) tables are stored when present
+    """
+    half_lives = dict(half_lives or {})
+    branches = branches or {}
+    materials = materials or {}
+
+    for daughters in branches.values():
+        for daughter, _ in daughters:
+            half_lives.setdefault(daughter, np.inf)
+    index = {name: i for i, name in enumerate(half_lives)}
+
+    nuclides = np.array(list(half_lives.items()), dtype=NUCLIDE_DTYPE)
+    branch_rows = np.array([
+        (index[parent], index[daughter], ratio)
+        for parent, daughters in branches.items()
+        for daughter, ratio in daughters
+    ], dtype=BRANCH_DTYPE)
+    material_rows = np.array([
+        (key, m.name, m.density, m.attenuation_coefficient, m.cost_per_cm3)
+        for key, m in materials.items()
+    ], dtype=MATERIAL_DTYPE)
+    attenuation_rows = np.array([
+        (row, energy, mu)
+        for row, m in enumerate(materials.values())
+        if m.mass_attenuation is not None
+        for energy, mu in zip(m.energies_mev, m.mass_attenuation)
+    ], dtype=ATTENUATION_DTYPE)
+
+    os.makedirs(path, exist_ok=True)
+    for table, rows in (('nuclides', nuclides), ('branches', branch_rows),
+                        ('materials', material_rows), ('attenuation', attenuation_rows)):
+        np.save(os.path.join(path, f'{table}.npy'), rows)
+
+    _open_stores.pop(os.path.abspath(path), None)
+
+
+def write_default_store(path):
+    """Write the built-in isotope and shielding tables to a store directory"""
+    from IsotopeDecayCalculator import IsotopeDecayCalculator
+    from RadiationShield import RadiationShield
+
+    calc = IsotopeDecayCalculator()
+    shield = RadiationShield()
+    write_store(path, calc.medical_isotopes, calc.decay_chains, shield.materials)
+
+
+def open_store(path):
+    """Open a store directory, reusing the instance already opened in this process"""
+    path = os.path.abspath(path)
+    if path not in _open_stores:
+        _open_stores[path] = NuclideDataStore(path)
+    return _open_stores[path]
+
+
+class NuclideDataStore:
+    """
+    Read-only nuclide and attenuation tables memory-mapped from disk.
+
+    Tables are mapped on first access and columns are returned as views
+    into the mapping, so nothing is parsed or copied. Name -> row lookups
+    are built once per store on first use.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._tables = {}
+        self._indexes = {}
+
+    def table(self, name):
+        """Memory-mapped structured array for one table"""
+        if name not in self._tables:
+            if name not in TABLES:
+                raise ValueError(f"Unknown table: {name}")
+            rows = np.load(os.path.join(self.path, f'{name}.npy'), mmap_mode='r')
+            if rows.dtype != TABLES[name]:
+                raise ValueError(f"Unexpected layout for table {name}: {rows.dtype}")
+            self._tables[name] = rows
+        return self._tables[name]
+
+    def has_table(self, name):
+        """Whether the store directory contains a table (older stores lack attenuation)"""
+        return name in self._tables or os.path.exists(os.path.join(self.path, f'{name}.npy'))
+
+    def column(self, table, field):
+        """Zero-copy view of one column of a table"""
+        return self.table(table)[field]
+
+    def index(self, table):
+        """Name -> row lookup for the nuclide or material table"""
+        if table not in self._indexes:
+            key_field = 'name' if table == 'nuclides' else 'key'
+            keys = self.column(table, key_field).tolist()
+            self._indexes[table] = {key: i for i, key in enumerate(keys)}
+        return self._indexes[table]
+
+    def attenuation_table(self, material_row):
+        """(energies, μ/ρ) views for one material, or (None, None) without a table"""
+        if not self.has_table('attenuation'):
+            return None, None
+        if 'attenuation' not in self._indexes:
+            materials = self.column('attenuation', 'material')
+            bounds = np.searchsorted(materials, np.arange(len(self.table('materials')) + 1))
+            self._indexes['attenuation'] = bounds
+        start, stop = self._indexes['attenuation'][material_row:material_row + 2]
+        if start == stop:
+            return None, None
+        rows = self.table('attenuation')[start:stop]
+        return rows['energy_mev'], rows['mass_attenuation']
+
+    def rows(self, table, names):
+        """Rows for an array of names; only the unique names are looked up"""
+        index = self.index(table)
+        names = np.asarray(names)
+        unique, inverse = np.unique(names, return_inverse=True)
+        lookup = np.array([index[name] for name in unique.tolist()], dtype=np.intp)
+        return lookup[inverse].reshape(names.shape)
+
+    def half_lives(self):
+        """Mapping view nuclide -> half-life in hours"""
+        return HalfLifeTable(self)
+
+    def decay_branches(self):
+        """Mapping view parent -> list of (daughter, branching_ratio)"""
+        return BranchTable(self)
+
+    def material_catalog(self):
+        """Mapping view material key -> Material"""
+        return MaterialCatalog(self)
+
+
+class HalfLifeTable(Mapping):
+    """Read-only dict-like view of the half-life column"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __getitem__(self, name):
+        return float(self.store.column('nuclides', 'half_life_hours')[self.store.index('nuclides')[name]])
+
+    def __iter__(self):
+        return iter(self.store.index('nuclides'))
+
+    def __len__(self):
+        return len(self.store.table('nuclides'))
+
+
+class BranchTable(Mapping):
+    """Read-only dict-like view of the branching table, grouped by parent"""
+
+    def __init__(self, store):
+        self.store = store
+        self._parents = None
+
+    def _by_parent(self):
+        if self._parents is None:
+            names = self.store.column('nuclides', 'name')
+            branches = self.store.table('branches')
+            self._parents = {}
+            for parent, daughter, ratio in branches.tolist():
+                self._parents.setdefault(str(names[parent]), []).append((str(names[daughter]), ratio))
+        return self._parents
+
+    def __getitem__(self, parent):
+        return self._by_parent()[parent]
+
+    def __iter__(self):
+        return iter(self._by_parent())
+
+    def __len__(self):
+        return len(self._by_parent())
+
+
+class MaterialCatalog(Mapping):
+    """Read-only dict-like view of the material table yielding Material objects"""
+
+    def __init__(self, store):
+        self.store = store
+
+    def __getitem__(self, key):
+        i = self.store.index('materials')[key]
+        row = self.store.table('materials')[i]
+        energies, mass_attenuation = self.store.attenuation_table(i)
+        return Material(str(row['name']), float(row['density']),
+                        float(row['attenuation_coefficient']), float(row['cost_per_cm3']),
+                        energies, mass_attenuation)
+
+    def __iter__(self):
+        return iter(self.store.index('materials'))
+
+    def __len__(self):
+        return len(self.store.table('materials'))
+
+    def packed_arrays(self):
+        """(index, density, mu, cost) as zero-copy columns of the material table"""
+        return (
+            self.store.index('materials'),
+            self.store.column('materials', 'density'),
+            self.store.column('materials', 'attenuation_coefficient'),
+            self.store.column('materials', 'cost_per_cm3')
+        )
@@ -0,0 +1,243 @@
+import contextlib
+import math
+import numpy as np
+from typing import NamedTuple
+
+# CODATA 2018 values as decimal strings, so high-precision backends start
+# from the published digits rather than from their float64 roundings
+CONSTANTS = {
+    'c': '299792458',                 # m/s (exact)
+    'h': '6.62607015e-34',            # J·s (exact)
+    'k_B': '1.380649e-23',            # J/K (exact)
+    'G': '6.67430e-11',               # m³/(kg·s²)
+    'epsilon_0': '8.8541878128e-12'   # F/m
+}
+# π for the decimal backend, which has no built-in constant
+PI = ('3.14159265358979323846264338327950288419716939937510'
+      '58209749445923078164062862089986280348253421170679')
+
+BACKENDS = ('float', 'decimal', 'mpmath')
+
+
+class Dimension(NamedTuple):
+    """Exponents of the Planck base quantities; multiplies and divides like the quantities"""
+    length: int = 0
+    mass: int = 0
+    time: int = 0
+    temperature: int = 0
+    charge: int = 0
+
+    def __mul__(self, other):
+        return Dimension(*(a + b for a, b in zip(self, other)))
+
+    def __truediv__(self, other):
+        return Dimension(*(a - b for a, b in zip(self, other)))
+
+    def __pow__(self, exponent):
+        return Dimension(*(a * exponent for a in self))
+
+
+LENGTH = Dimension(length=1)
+MASS = Dimension(mass=1)
+TIME = Dimension(time=1)
+TEMPERATURE = Dimension(temperature=1)
+CHARGE = Dimension(charge=1)
+
+VELOCITY = LENGTH / TIME
+ACCELERATION = VELOCITY / TIME
+MOMENTUM = MASS * VELOCITY
+FORCE = MASS * ACCELERATION
+ENERGY = FORCE * LENGTH
+POWER = ENERGY / TIME
+
+QUANTITIES = {
+    'length': LENGTH,
+    'mass': MASS,
+    'time': TIME,
+    'temperature': TEMPERATURE,
+    'charge': CHARGE,
+    'area': LENGTH ** 2,
+    'volume': LENGTH ** 3,
+    'frequency': TIME ** -1,
+    'velocity': VELOCITY,
+    'acceleration': ACCELERATION,
+    'momentum': MOMENTUM,
+    'force': FORCE,
+    'energy': ENERGY,
+    'power': POWER,
+    'action': ENERGY * TIME,
+    'pressure': FORCE / LENGTH ** 2,
+    'density': MASS / LENGTH ** 3,
+    'energy_density': ENERGY / LENGTH ** 3,
+    'current': CHARGE / TIME,
+    'voltage': ENERGY / CHARGE,
+    'electric_field': FORCE / CHARGE,
+    'entropy': ENERGY / TEMPERATURE
+}
+
+
+def dimension_of(quantity):
+    """Dimension for a quantity name, Dimension or tuple of exponents"""
+    if isinstance(quantity, str):
+        if quantity not in QUANTITIES:
+            raise ValueError(f"Unknown quantity: {quantity}")
+        return QUANTITIES[quantity]
+    return Dimension(*quantity)
+
+
+class PlanckConverter:
+    """
+    Converts SI values to and from Planck units for any dimension.
+
+    The SI size of one Planck unit is computed once per dimension and kept
+    in `factors`, so a conversion is a single array division. The 'float'
+    backend works on float64 NumPy arrays; 'decimal' and 'mpmath' carry
+    `digits` significant digits through the constants and the conversion
+    and return object arrays, for ratios such as 1 m ≈ 6e34 ℓP whose
+    float64 products drift in the last digits.
+    """
+
+    def __init__(self, backend='float', digits=50):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        if backend == 'decimal' and digits > len(PI) - 2:
+            raise ValueError(f"decimal backend supports at most {len(PI) - 2} digits")
+        self.backend = backend
+        self.digits = digits
+        with self._context():
+            self.base = self._planck_base()
+            self.factors = {dimension: self._factor(dimension) for dimension in QUANTITIES.values()}
+
+    def _context(self):
+        """Precision context for arithmetic in this backend"""
+        if self.backend == 'decimal':
+            import decimal
+            return decimal.localcontext(prec=self.digits)
+        if self.backend == 'mpmath':
+            import mpmath
+            return mpmath.workdps(self.digits)
+        return contextlib.nullcontext()
+
+    def _number(self, value):
+        """Value as a number of this backend; strings are parsed at full precision"""
+        if isinstance(value, float):
+            value = str(value)  # Shortest decimal form, not the binary expansion
+        if self.backend == 'decimal':
+            from decimal import Decimal
+            return +Decimal(value)
+        if self.backend == 'mpmath':
+            import mpmath
+            return mpmath.mpf(value)
+        return float(value)
+
+    def _sqrt(self, value):
+        if self.backend == 'decimal':
+            return value.sqrt()
+        if self.backend == 'mpmath':
+            import mpmath
+            return mpmath.sqrt(value)
+        return math.sqrt(value)
+
+    def _pi(self):
+        if self.backend == 'decimal':
+            return self._number(PI)
+        if self.backend == 'mpmath':
+            import mpmath
+            return +mpmath.pi
+        return math.pi
+
+    def _planck_base(self):
+        """SI values of the Planck length, mass, time, temperature and charge"""
+        c, h, k_B, G, epsilon_0 = (self._number(CONSTANTS[name])
+                                   for name in ('c', 'h', 'k_B', 'G', 'epsilon_0'))
+        pi = self._pi()
+        hbar = h / (2 * pi)
+        return Dimension(
+            length=self._sqrt(hbar * G / c ** 3),
+            mass=self._sqrt(hbar * c / G),
+            time=self._sqrt(hbar * G / c ** 5),
+            temperature=self._sqrt(hbar * c ** 5 / G) / k_B,
+            charge=self._sqrt(4 * pi * epsilon_0 * hbar * c)
+        )
+
+    def _factor(self, dimension):
+        """SI value of one Planck unit of a dimension"""
+        factor = self._number(1)
+        for base, exponent in zip(self.base, dimension):
+            if exponent:
+                factor *= base ** exponent
+        return factor
+
+    def unit(self, quantity):
+        """SI value of one Planck unit of a quantity, computed once per dimension"""
+        dimension = dimension_of(quantity)
+        if dimension not in self.factors:
+            with self._context():
+                self.factors[dimension] = self._factor(dimension)
+        return self.factors[dimension]
+
+    def _convert(self, values, factor, inverse):
+        if self.backend == 'float':
+            values = np.asarray(values, dtype=float)
+            return values * factor if inverse else values / factor
+        with self._context():
+            numbers = np.frompyfunc(self._number, 1, 1)(np.asarray(values, dtype=object))
+            return numbers * factor if inverse else numbers / factor
+
+    def to_planck(self, values, quantity):
+        """
+        Express SI values in Planck units
+
+        Parameters:
+        values: Scalar or array in SI units; strings are accepted by the
+                high-precision backends and parsed without rounding to float
+        quantity: Quantity name (see QUANTITIES) or Dimension
+
+        Returns:
+        Values in Planck units, float64 or object array by backend
+        """
+        return self._convert(values, self.unit(quantity), inverse=False)
+
+    def from_planck(self, values, quantity):
+        """Express values given in Planck units in SI units"""
+        return self._convert(values, self.unit(quantity), inverse=True)
+
+
+# Converters built in this process, keyed by (backend, digits)
+_converters = {}
+
+
+def converter(backend='float', digits=50):
+    """Shared converter for a backend, so factor tables are built once per process"""
+    key = (backend, digits if backend != 'float' else None)
+    if key not in _converters:
+        _converters[key] = PlanckConverter(backend, digits)
+    return _converters[key]
+
+
+def to_planck(values, quantity, backend='float', digits=50):
+    """SI values -> Planck units; see PlanckConverter.to_planck"""
+    return converter(backend, digits).to_planck(values, quantity)
+
+
+def from_planck(values, quantity, backend='float', digits=50):
+    """Planck units -> SI values; see PlanckConverter.from_planck"""
+    return converter(backend, digits).from_planck(values, quantity)
+
+
+def main():
+    examples = [(1.0, 'length', 'm'), (1.0, 'time', 's'), (1.0, 'mass', 'kg'),
+                (1.0, 'temperature', 'K'), (1.0, 'energy', 'J'), (1.0, 'force', 'N'),
+                (1000.0, 'density', 'kg/m³')]
+    print("SI value -> Planck units (float64)")
+    for value, quantity, unit in examples:
+        print(f"  {value:g} {unit} = {to_planck(value, quantity):.6e} Planck {quantity}")
+
+    import mpmath
+    print("\nOne metre in Planck lengths:")
+    print(f"  float64:             {to_planck(1.0, 'length'):.17g}")
+    print(f"  mpmath (40 digits):  {mpmath.nstr(to_planck('1', 'length', backend='mpmath', digits=40), 40)}")
+    print(f"  decimal (40 digits): {to_planck('1', 'length', backend='decimal', digits=40):.39e}")
+
+if __name__ == "__main__":
+    main()
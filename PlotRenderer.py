@@ -0,0 +1,110 @@
+import os
+import numpy as np
+
+# Set CALC_PLOTS=interactive to keep the default GUI backend and show figures
+INTERACTIVE = os.environ.get('CALC_PLOTS', 'headless') == 'interactive'
+
+# Figures reused across calls, keyed by plot name and layout
+_figures = {}
+
+
+def pyplot():
+    """Import pyplot, selecting the non-interactive Agg backend unless running interactively"""
+    import matplotlib
+    if not INTERACTIVE:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def figure(key, figsize=(10, 6), nrows=1, ncols=1):
+    """
+    Figure and axes for a named plot, reused across calls
+
+    The figure is created once per key, layout and process; later calls
+    clear the axes instead of building a new figure.
+    """
+    layout = (key, tuple(figsize), nrows, ncols)
+    cached = _figures.get(layout)
+    if cached is not None:
+        fig, axes = cached
+        for ax in np.ravel(axes):
+            ax.clear()
+        return fig, axes
+
+    plt = pyplot()
+    fig, axes = plt.subplots(nrows, ncols, figsize=figsize)
+    _figures[layout] = (fig, axes)
+    return fig, axes
+
+
+def finish(fig, output_path=None):
+    """
+    Complete a figure: save it when a path is given, show it when running
+    interactively, otherwise leave it for the caller
+
+    Returns:
+    output_path, or the figure when no path is given
+    """
+    if output_path is not None:
+        fig.savefig(output_path)
+        return output_path
+    if INTERACTIVE:
+        pyplot().show()
+    return fig
+
+
+def decimate_minmax(x, y, columns):
+    """
+    Reduce a line to the minimum and maximum of y in each of `columns`
+    equal-count bins of the (sorted) x values, keeping their original order
+
+    Lines with at most 2 * columns points are returned unchanged.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if n <= 2 * columns:
+        return x, y
+
+    per_column = n // columns
+    usable = per_column * columns
+    blocks = y[:usable].reshape(columns, per_column)
+    offsets = np.arange(columns)[:, None] * per_column
+    picks = np.sort(np.column_stack([blocks.argmin(axis=1), blocks.argmax(axis=1)]), axis=1)
+    idx = (picks + offsets).ravel()
+    if usable < n:
+        idx = np.append(idx, n - 1)
+    return x[idx], y[idx]
+
+
+def plot_line(ax, x, y, *args, **kwargs):
+    """ax.plot with min/max decimation to the pixel width of the axes"""
+    fig = ax.figure
+    columns = max(1, int(ax.get_position().width * fig.get_figwidth() * fig.dpi))
+    x, y = decimate_minmax(x, y, columns)
+    return ax.plot(x, y, *args, **kwargs)
+
+
+def _render_job(job):
+    func, args, kwargs, output_path = job
+    func(*args, output_path=output_path, **kwargs)
+    return output_path
+
+
+def render_batch(jobs, max_workers=None):
+    """
+    Render many figures to files in parallel worker processes
+
+    Parameters:
+    jobs: Iterable of (plot_function, args, kwargs, output_path); the plot
+          function must be picklable and accept an output_path keyword
+    max_workers: Number of worker processes (default: CPU count)
+
+    Returns:
+    List of written paths, in job order
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_render_job, jobs))
@@ -1,6 +1,39 @@
+import math
 import numpy as np
-import matplotlib.pyplot as plt
+from PlotRenderer import figure, finish, plot_line
+from Instrumentation import instrument
+from SolverCache import LRUCache, array_digest
+from RecordTables import RecordTable, RecordView
+from collections.abc import Mapping
 from dataclasses import dataclass
+from typing import Optional
+
+# Photon energies (MeV) of the tabulated mass attenuation coefficients
+TABLE_ENERGIES_MEV = np.array([
+    0.1, 0.15, 0.2, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0,
+    1.25, 1.5, 2.0, 3.0, 4.0, 5.0, 6.0, 8.0, 10.0
+])
+
+# Total mass attenuation coefficients μ/ρ (cm²/g) on TABLE_ENERGIES_MEV,
+# after the NIST XCOM tables (steel as iron, earth as generic soil)
+MASS_ATTENUATION_TABLES = {
+    "concrete": [0.1693, 0.1438, 0.1291, 0.1114, 0.09944, 0.09072, 0.08387, 0.07360, 0.06620,
+                 0.05919, 0.05391, 0.04638, 0.03758, 0.03266, 0.02953, 0.02745, 0.02487, 0.02344],
+    "lead": [5.549, 2.014, 0.9985, 0.4031, 0.2323, 0.1614, 0.1248, 0.08870, 0.07102,
+             0.05876, 0.05222, 0.04606, 0.04234, 0.04197, 0.04272, 0.04391, 0.04675, 0.04972],
+    "water": [0.1707, 0.1505, 0.1370, 0.1186, 0.1061, 0.09687, 0.08956, 0.07865, 0.07072,
+              0.06323, 0.05754, 0.04942, 0.03969, 0.03403, 0.03031, 0.02770, 0.02429, 0.02219],
+    "steel": [0.3717, 0.1964, 0.1460, 0.1099, 0.09400, 0.08414, 0.07704, 0.06699, 0.05995,
+              0.05350, 0.04883, 0.04265, 0.03621, 0.03312, 0.03146, 0.03057, 0.02991, 0.02994],
+    "earth": [0.1677, 0.1425, 0.1280, 0.1105, 0.09867, 0.09005, 0.08324, 0.07306, 0.06571,
+              0.05875, 0.05351, 0.04604, 0.03731, 0.03243, 0.02932, 0.02725, 0.02470, 0.02328]
+}
+
+# Argument types taken by the scalar fast paths
+_SCALARS = (int, float, np.integer, np.floating)
+
+# Distinct (table grid, query grid) pairs kept by RadiationShield._interpolation
+INTERPOLATION_CACHE_SIZE = 128
 
 @dataclass
 class Material:
@@ -9,9 +42,152 @@ class Material:
     density: float  # g/cm³
     attenuation_coefficient: float  # cm²/g
     cost_per_cm3: float  # dollars per cm³
+    energies_mev: Optional[np.ndarray] = None  # Photon energies of the μ/ρ(E) table
+    mass_attenuation: Optional[np.ndarray] = None  # μ/ρ(E) in cm²/g
+
+    # Bumped on every field assignment of this Material, so packed copies
+    # of its properties know when to rebuild
+    _revision = 0
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, '_revision', self._revision + 1)
+
+# Record layout of compare_materials(as_table=True); a MaterialTable uses
+# the material layout of NuclideDataStore (MATERIAL_DTYPE)
+COMPARISON_DTYPE = np.dtype([
+    ('material', 'U16'),
+    ('thickness_cm', 'f8'),
+    ('cost_usd', 'f8'),
+    ('weight_kg', 'f8')
+])
+
+class MaterialRow(RecordView):
+    """Row of a MaterialTable; reads and writes like a Material"""
+    __slots__ = ()
+
+    @property
+    def energies_mev(self):
+        return self._table.spectra[self._index][0]
+
+    @energies_mev.setter
+    def energies_mev(self, value):
+        self._table.spectra[self._index] = (value, self.mass_attenuation)
+
+    @property
+    def mass_attenuation(self):
+        return self._table.spectra[self._index][1]
+
+    @mass_attenuation.setter
+    def mass_attenuation(self, value):
+        self._table.spectra[self._index] = (self.energies_mev, value)
+
+class MaterialTable(RecordTable, Mapping):
+    """
+    Materials as one structured array, keyed like RadiationShield.materials
+
+    Looking up a key gives a MaterialRow; the μ/ρ(E) tables are kept per
+    row beside the array. RadiationShield reads the columns directly
+    (packed_arrays), as it does for a NuclideDataStore catalog.
+    """
+    row_base = MaterialRow
+
+    def __init__(self, data, spectra=None):
+        super().__init__(data)
+        self.spectra = list(spectra) if spectra is not None else [(None, None)] * len(self.data)
+        self._keys = {key: i for i, key in enumerate(self.data['key'].tolist())}
+
+    @classmethod
+    def from_materials(cls, materials):
+        """Table from a mapping of key -> Material"""
+        from NuclideDataStore import MATERIAL_DTYPE  # Imports this module
+
+        data = np.zeros(len(materials), dtype=MATERIAL_DTYPE)
+        for i, (key, m) in enumerate(materials.items()):
+            data[i] = (key, m.name, m.density, m.attenuation_coefficient, m.cost_per_cm3)
+        return cls(data, [(m.energies_mev, m.mass_attenuation) for m in materials.values()])
+
+    def to_materials(self):
+        """Dict of key -> Material copies"""
+        return {key: Material(row.name, row.density, row.attenuation_coefficient, row.cost_per_cm3,
+                              row.energies_mev, row.mass_attenuation)
+                for key, row in self.items()}
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            return self._row(self, self._keys[key])
+        rows = np.arange(len(self.data))[key]
+        if np.ndim(rows) == 0:
+            return self._row(self, int(rows))
+        return type(self)(self.data[rows], [self.spectra[i] for i in rows.tolist()])
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def packed_arrays(self):
+        """(index, density, mu, cost) as zero-copy columns"""
+        return (self._keys, self.data['density'], self.data['attenuation_coefficient'],
+                self.data['cost_per_cm3'])
+
+@dataclass
+class PhotonSpectrum:
+    """Source photon spectrum as energies with integration weights (fractions of intensity)"""
+    energies_mev: np.ndarray
+    weights: np.ndarray
+
+    @classmethod
+    def lines(cls, energies_mev, intensities):
+        """Discrete gamma lines with relative intensities"""
+        intensities = np.asarray(intensities, dtype=float)
+        return cls(np.asarray(energies_mev, dtype=float), intensities / intensities.sum())
 
+    @classmethod
+    def continuum(cls, energies_mev, spectral_density):
+        """Continuous spectrum sampled on an energy grid (trapezoidal integration)"""
+        energies = np.asarray(energies_mev, dtype=float)
+        density = np.asarray(spectral_density, dtype=float)
+        widths = np.diff(energies)
+        weights = np.zeros_like(energies)
+        weights[:-1] += 0.5 * widths
+        weights[1:] += 0.5 * widths
+        weights *= density
+        return cls(energies, weights / weights.sum())
+
+@dataclass
+class BuildupFactors:
+    """
+    Buildup B(x) of one material: broad-beam over narrow-beam transmission
+    of a slab of thickness x, e.g. from PhotonTransport.SlabTransport
+    """
+    material: str  # Key in RadiationShield.materials
+    thicknesses_cm: np.ndarray  # Increasing slab thicknesses
+    factors: np.ndarray  # B at those thicknesses
+
+    def __call__(self, thickness):
+        """B at any thickness: piecewise linear, B = 1 at x = 0, linear past the table"""
+        x = np.append(0.0, np.asarray(self.thicknesses_cm, dtype=float))
+        b = np.append(1.0, np.asarray(self.factors, dtype=float))
+        if x[1] == 0.0:
+            x, b = x[1:], b[1:]
+        thickness = np.asarray(thickness, dtype=float)
+        slope = (b[-1] - b[-2]) / (x[-1] - x[-2]) if len(x) > 1 else 0.0
+        return np.where(thickness > x[-1], b[-1] + slope * (thickness - x[-1]),
+                        np.interp(thickness, x, b))
+
+@instrument('calculate_attenuation_batch', 'calculate_required_thickness_batch',
+            'mass_attenuation_at', 'calculate_spectrum_transmission', 'calculate_attenuation',
+            'calculate_required_thickness', 'compare_materials')
 class RadiationShield:
-    def __init__(self):
+    def __init__(self, data_store=None, cache=None, materials=None):
+        # Optional SolverCache.LRUCache or SharedMemoryCache for calculate_required_thickness
+        self.cache = cache
+        if data_store is not None or materials is not None:
+            # Attenuation tables memory-mapped from a NuclideDataStore, or a
+            # caller's mapping of key -> Material such as a MaterialTable
+            self.materials = materials if materials is not None else data_store.material_catalog()
+            self._interpolation_cache = LRUCache(maxsize=INTERPOLATION_CACHE_SIZE)
+            return
+
         # Common shielding materials with their properties
         self.materials = {
             "concrete": Material("Concrete", 2.3, 0.0573, 0.02),
@@ -20,7 +196,239 @@ class RadiationShield:
             "steel": Material("Steel", 7.874, 0.0706, 0.15),
             "earth": Material("Earth", 1.6, 0.0512, 0.001)
         }
+        for key, material in self.materials.items():
+            material.energies_mev = TABLE_ENERGIES_MEV
+            material.mass_attenuation = np.array(MASS_ATTENUATION_TABLES[key])
+
+        # Log-log interpolation indices keyed by (table grid, query grid)
+        self._interpolation_cache = LRUCache(maxsize=INTERPOLATION_CACHE_SIZE)
     
+    def _material_arrays(self):
+        """
+        Pack the materials dict into contiguous property arrays.
+
+        Returns (index, density, mu, cost) where index maps material name to
+        its row in the arrays. The packing is rebuilt when any entry is added,
+        removed or replaced, or a field of one of its Materials is assigned.
+        Store-backed catalogs and MaterialTables hand out their columns
+        directly.
+        """
+        if hasattr(self.materials, 'packed_arrays'):
+            return self.materials.packed_arrays()
+
+        members = list(self.materials.items())
+        signature = [(name, id(m), m._revision) for name, m in members]
+        if getattr(self, '_packed_signature', None) != signature:
+            self._packed = (
+                {name: i for i, (name, _) in enumerate(members)},
+                np.array([m.density for _, m in members], dtype=float),
+                np.array([m.attenuation_coefficient for _, m in members], dtype=float),
+                np.array([m.cost_per_cm3 for _, m in members], dtype=float),
+            )
+            self._packed_signature = signature
+            # Holding the packed Materials keeps their ids from being reused
+            self._packed_members = members
+        return self._packed
+
+    def _linear_coefficient(self, material_name):
+        """μ·ρ (1/cm) of one material as a float, for the scalar paths"""
+        if hasattr(self.materials, 'packed_arrays'):
+            index, density, mu, _ = self.materials.packed_arrays()
+            i = index[material_name]
+            return float(mu[i]) * float(density[i])
+        material = self.materials[material_name]
+        return material.attenuation_coefficient * material.density
+
+    def material_indices(self, material_names):
+        """
+        Map material names (scalar or array) to rows of the packed arrays.
+        Only the unique names are looked up in Python.
+        """
+        index = self._material_arrays()[0]
+        names = np.asarray(material_names)
+        unique, inverse = np.unique(names, return_inverse=True)
+        lookup = np.array([index[name] for name in unique.tolist()], dtype=np.intp)
+        return lookup[inverse].reshape(names.shape)
+
+    def calculate_attenuation_batch(self, initial_intensities, material_names, thicknesses):
+        """
+        Beer-Lambert attenuation for many (intensity, material, thickness)
+        tuples in a single broadcasted pass.
+
+        Parameters:
+        initial_intensities: Initial radiation intensities (array-like)
+        material_names: Material names (array-like of str)
+        thicknesses: Shield thicknesses in cm (array-like)
+
+        Returns:
+        final_intensities: Array with the broadcast shape of the inputs
+        """
+        _, density, mu, _ = self._material_arrays()
+        idx = self.material_indices(material_names)
+        mu_rho = mu[idx] * density[idx]
+        return np.asarray(initial_intensities, dtype=float) * \
+            np.exp(-mu_rho * np.asarray(thicknesses, dtype=float))
+
+    def calculate_required_thickness_batch(self, initial_intensities, target_intensities,
+                                           material_names, spectrum=None, buildup=None):
+        """
+        Required thickness for many (intensity, target, material) tuples at once.
+        With a PhotonSpectrum there is no closed form and the thicknesses are
+        found with a vectorized root-finder. With buildup (a BuildupFactors or
+        a dict of them by material) the broad-beam transmission
+        B(x) * narrow-beam transmission is solved instead for those materials.
+        """
+        _, density, mu, _ = self._material_arrays()
+        idx = self.material_indices(material_names)
+        ratio = np.asarray(target_intensities, dtype=float) / \
+            np.asarray(initial_intensities, dtype=float)
+        if spectrum is None:
+            thickness = -np.log(ratio) / (mu[idx] * density[idx])
+        else:
+            thickness = self._spectrum_thickness(idx, ratio, spectrum)
+        if buildup is not None:
+            thickness = self._thickness_with_buildup(thickness, idx, np.log(ratio), spectrum, buildup)
+        return thickness
+
+    def _spectrum_thickness(self, idx, ratio, spectrum):
+        """Narrow-beam thickness for a source spectrum, one root-finder pass per material"""
+        _, density, _, _ = self._material_arrays()
+        idx, log_ratio = np.broadcast_arrays(idx, np.log(ratio))
+        index = self._material_arrays()[0]
+        names = {row: name for name, row in index.items()}
+        thickness = np.empty(log_ratio.shape)
+        # One root-finder pass per material; each is vectorized over its ratios
+        for row in np.unique(idx).tolist():
+            mask = idx == row
+            mu_rho = self.mass_attenuation_at(names[row], spectrum.energies_mev) * density[row]
+            thickness[mask] = self._solve_spectrum_thickness(log_ratio[mask], mu_rho, spectrum.weights)
+        return thickness
+
+    def _thickness_with_buildup(self, thickness, idx, log_ratio, spectrum, buildup, max_iter=100):
+        """
+        Thickness at which B(x) times the narrow-beam transmission reaches the
+        ratio. B >= 1, so the narrow-beam thickness brackets the root from
+        below; the upper bracket is found by doubling, then bisection.
+        """
+        if isinstance(buildup, BuildupFactors):
+            buildup = {buildup.material: buildup}
+        index, density, mu, _ = self._material_arrays()
+        thickness, idx, log_ratio = np.broadcast_arrays(thickness, idx, log_ratio)
+        thickness = np.array(thickness, dtype=float)
+
+        for name, factors in buildup.items():
+            row = index[name]
+            mask = (idx == row) & (log_ratio < 0)
+            if not mask.any():
+                continue
+            if spectrum is None:
+                k, weights = np.array([mu[row] * density[row]]), np.ones(1)
+            else:
+                k = self.mass_attenuation_at(name, spectrum.energies_mev) * density[row]
+                weights = spectrum.weights
+            target = log_ratio[mask]
+
+            def excess(x):
+                # log(B(x) Σ w e^(-kx)) - log ratio, shifted against underflow
+                exponent = -np.multiply.outer(x, k)
+                shift = exponent.max(axis=-1)
+                log_t = shift + np.log(np.exp(exponent - shift[..., None]) @ weights)
+                return log_t + np.log(factors(x)) - target
+
+            low = thickness[mask]
+            high = 2 * low
+            for _ in range(max_iter):
+                short = excess(high) > 0
+                if not short.any():
+                    break
+                low = np.where(short, high, low)
+                high = np.where(short, 2 * high, high)
+            for _ in range(max_iter):
+                mid = 0.5 * (low + high)
+                short = excess(mid) > 0
+                low = np.where(short, mid, low)
+                high = np.where(short, high, mid)
+                if np.all(high - low <= 1e-10 * np.maximum(high, 1.0)):
+                    break
+            thickness[mask] = 0.5 * (low + high)
+        return thickness
+
+    def _interpolation(self, table_energies, energies):
+        """Cached log-log interpolation indices and fractions of energies on a table grid"""
+        key = (table_energies.tobytes(), energies.tobytes())
+
+        def compute():
+            log_table = np.log(table_energies)
+            log_e = np.clip(np.log(energies), log_table[0], log_table[-1])
+            idx = np.clip(np.searchsorted(log_table, log_e, side='right') - 1, 0, len(log_table) - 2)
+            frac = (log_e - log_table[idx]) / (log_table[idx + 1] - log_table[idx])
+            return idx, frac
+
+        return self._interpolation_cache.get(key, compute)
+
+    def mass_attenuation_at(self, material_name, energies_mev):
+        """
+        μ/ρ (cm²/g) of a material at the given photon energies, by log-log
+        interpolation of its table. Energies outside the table are clamped
+        to its ends; materials without a table use their scalar coefficient.
+        """
+        material = self.materials[material_name]
+        energies = np.asarray(energies_mev, dtype=float)
+        if material.mass_attenuation is None:
+            return np.full(energies.shape, material.attenuation_coefficient)
+
+        idx, frac = self._interpolation(np.asarray(material.energies_mev, dtype=float), energies)
+        log_mu = np.log(np.asarray(material.mass_attenuation, dtype=float))
+        return np.exp(log_mu[idx] + frac * (log_mu[idx + 1] - log_mu[idx]))
+
+    def calculate_spectrum_transmission(self, initial_intensity, material_name, thicknesses, spectrum):
+        """
+        Intensity behind a slab for a whole source spectrum:
+        I(x) = I₀ * Σ w(E) e^(-μ(E)ρx)
+
+        Parameters:
+        initial_intensity: Initial radiation intensity
+        material_name: Name of shielding material
+        thicknesses: Shield thicknesses in cm (array-like)
+        spectrum: PhotonSpectrum of the source
+
+        Returns:
+        Transmitted intensities with the shape of thicknesses
+        """
+        mu_rho = self.mass_attenuation_at(material_name, spectrum.energies_mev) * \
+            self.materials[material_name].density
+        x = np.asarray(thicknesses, dtype=float)
+        return initial_intensity * (np.exp(-x[..., None] * mu_rho) @ spectrum.weights)
+
+    @staticmethod
+    def _solve_spectrum_thickness(log_ratio, mu_rho, weights, tol=1e-10, max_iter=100):
+        """
+        Vectorized Newton solve of log Σ w e^(-kx) = log_ratio for x, for
+        one material's attenuation coefficients k and an array of ratios.
+
+        The left-hand side is convex and decreasing in x. By Jensen's inequality
+        it lies above -x Σ w k, whose root is therefore a starting point left
+        of the solution from which the Newton iterates increase monotonically.
+        """
+        k = mu_rho[weights > 0]
+        weights = weights[weights > 0]
+        x = -log_ratio / (k @ weights)
+        active = np.ones(log_ratio.shape, dtype=bool)
+        for _ in range(max_iter):
+            exponent = np.multiply.outer(x[active], -k)
+            shift = exponent.max(axis=1, keepdims=True)
+            terms = np.exp(exponent - shift)
+            total = terms @ weights
+            f = shift[:, 0] + np.log(total) - log_ratio[active]
+            slope = -(terms @ (weights * k)) / total
+            step = f / slope
+            x[active] -= step
+            done = np.abs(step) <= tol * np.maximum(np.abs(x[active]), 1.0)
+            active[np.flatnonzero(active)[done]] = False
+            if not active.any():
+                break
+        return x
+
     def calculate_attenuation(self, initial_intensity, material_name, thickness):
         """
         Calculate radiation intensity after passing through shielding
@@ -34,63 +442,107 @@ class RadiationShield:
         Returns:
         final_intensity: Radiation intensity after shielding
         """
-        material = self.materials[material_name]
-        mu = material.attenuation_coefficient
-        rho = material.density
-        
-        final_intensity = initial_intensity * np.exp(-mu * rho * thickness)
-        return final_intensity
+        if type(material_name) is str and isinstance(initial_intensity, _SCALARS) and \
+                isinstance(thickness, _SCALARS):
+            return initial_intensity * math.exp(-self._linear_coefficient(material_name) * thickness)
+        return self.calculate_attenuation_batch(
+            initial_intensity, material_name, thickness
+        )[()]
     
-    def calculate_required_thickness(self, initial_intensity, target_intensity, material_name):
+    def calculate_required_thickness(self, initial_intensity, target_intensity, material_name,
+                                     spectrum=None, buildup=None):
         """Calculate required thickness to achieve desired radiation reduction"""
-        material = self.materials[material_name]
-        mu = material.attenuation_coefficient
-        rho = material.density
-        
-        # Rearranged Beer-Lambert law to solve for thickness
-        thickness = -np.log(target_intensity / initial_intensity) / (mu * rho)
-        return thickness
+        def solve():
+            # Rearranged Beer-Lambert law to solve for thickness
+            if spectrum is None and buildup is None and type(material_name) is str and \
+                    isinstance(initial_intensity, _SCALARS) and isinstance(target_intensity, _SCALARS):
+                ratio = target_intensity / initial_intensity
+                if ratio > 0:
+                    return -math.log(ratio) / self._linear_coefficient(material_name)
+            return self.calculate_required_thickness_batch(
+                initial_intensity, target_intensity, material_name, spectrum, buildup
+            )[()]
+        if self.cache is None:
+            return solve()
+        return self.cache.get(self._thickness_key(initial_intensity, target_intensity, material_name,
+                                                  spectrum, buildup), solve)
+
+    def _thickness_key(self, initial_intensity, target_intensity, material_name, spectrum, buildup):
+        """
+        Cache key holding everything the thickness depends on, including the
+        material's current properties, so mutated materials miss the cache
+        """
+        m = self.materials[material_name]
+        key = ('required_thickness', material_name, float(target_intensity / initial_intensity),
+               m.density, m.attenuation_coefficient)
+        if spectrum is not None:
+            key += (array_digest(spectrum.energies_mev, spectrum.weights,
+                                 m.energies_mev, m.mass_attenuation),)
+        if buildup is not None:
+            tables = buildup.values() if isinstance(buildup, dict) else [buildup]
+            key += tuple((b.material, array_digest(b.thicknesses_cm, b.factors)) for b in tables)
+        return key
     
-    def compare_materials(self, initial_intensity, target_intensity):
-        """Compare different materials for achieving target radiation reduction"""
-        results = []
-        
-        for material_name in self.materials:
-            thickness = self.calculate_required_thickness(
-                initial_intensity, target_intensity, material_name
+    def material_table(self):
+        """The materials as a MaterialTable (the table itself when they already are one)"""
+        if isinstance(self.materials, MaterialTable):
+            return self.materials
+        return MaterialTable.from_materials(self.materials)
+
+    def compare_materials(self, initial_intensity, target_intensity, spectrum=None, as_table=False):
+        """
+        Compare different materials for achieving target radiation reduction.
+        With as_table a RecordTable of COMPARISON_DTYPE is returned instead
+        of a list of dicts; its rows support the same result['key'] access.
+        """
+        names = list(self.materials)
+        _, density, mu, cost_per_cm3 = self._material_arrays()
+        if spectrum is None:
+            # Packed rows follow the materials' order; no name lookup needed
+            with np.errstate(divide='ignore'):
+                thickness = -np.log(np.float64(target_intensity) / initial_intensity) / (mu * density)
+        else:
+            thickness = self.calculate_required_thickness_batch(
+                initial_intensity, target_intensity, names, spectrum
             )
-            material = self.materials[material_name]
-            volume = thickness * 100 * 100  # Assuming 1m x 1m shield
-            cost = volume * material.cost_per_cm3
-            
-            results.append({
-                'material': material_name,
-                'thickness_cm': thickness,
-                'cost_usd': cost,
-                'weight_kg': volume * material.density / 1000
-            })
+        volume = thickness * 100 * 100  # Assuming 1m x 1m shield
+        cost = volume * cost_per_cm3
+        weight = volume * density / 1000
         
-        return results
+        if as_table:
+            data = np.zeros(len(names), dtype=COMPARISON_DTYPE)
+            data['material'], data['thickness_cm'] = names, thickness
+            data['cost_usd'], data['weight_kg'] = cost, weight
+            return RecordTable(data)
+        return [
+            {
+                'material': name,
+                'thickness_cm': thickness[i],
+                'cost_usd': cost[i],
+                'weight_kg': weight[i]
+            }
+            for i, name in enumerate(names)
+        ]
 
-    def plot_attenuation_curves(self, initial_intensity, max_thickness=100):
+    def plot_attenuation_curves(self, initial_intensity, max_thickness=100, output_path=None):
         """Plot attenuation curves for different materials"""
         thicknesses = np.linspace(0, max_thickness, 1000)
-        plt.figure(figsize=(10, 6))
+        fig, ax = figure('attenuation_curves', figsize=(10, 6))
         
-        for material_name in self.materials:
-            intensities = [
-                self.calculate_attenuation(initial_intensity, material_name, t)
-                for t in thicknesses
-            ]
-            plt.plot(thicknesses, intensities, label=material_name.capitalize())
+        names = list(self.materials)
+        intensities = self.calculate_attenuation_batch(
+            initial_intensity, np.array(names)[:, None], thicknesses[None, :]
+        )
+        for material_name, curve in zip(names, intensities):
+            plot_line(ax, thicknesses, curve, label=material_name.capitalize())
         
-        plt.xlabel('Shield Thickness (cm)')
-        plt.ylabel('Radiation Intensity (relative units)')
-        plt.title('Radiation Attenuation by Material')
-        plt.yscale('log')
-        plt.grid(True)
-        plt.legend()
-        plt.show()
+        ax.set_xlabel('Shield Thickness (cm)')
+        ax.set_ylabel('Radiation Intensity (relative units)')
+        ax.set_title('Radiation Attenuation by Material')
+        ax.set_yscale('log')
+        ax.grid(True)
+        ax.legend()
+        return finish(fig, output_path)
 
 def main():
     shield = RadiationShield()
@@ -121,8 +573,22 @@ def main():
             result['cost_usd']
         ))
     
+    # Same comparison for the Cs-137 gamma line and a Co-60 source
+    print("\nRequired shielding for Cs-137 (0.662 MeV) and Co-60 (1.17 + 1.33 MeV):")
+    cs137 = PhotonSpectrum.lines([0.662], [1.0])
+    co60 = PhotonSpectrum.lines([1.173, 1.332], [1.0, 1.0])
+    print("\n{:<10} {:<15} {:<15}".format("Material", "Cs-137 (cm)", "Co-60 (cm)"))
+    print("-" * 40)
+    for name in shield.materials:
+        print("{:<10} {:<15.2f} {:<15.2f}".format(
+            name.capitalize(),
+            shield.calculate_required_thickness(initial_intensity, target_intensity, name, cs137),
+            shield.calculate_required_thickness(initial_intensity, target_intensity, name, co60)
+        ))
+    
     # Plot attenuation curves
-    shield.plot_attenuation_curves(initial_intensity)
+    path = shield.plot_attenuation_curves(initial_intensity, output_path="attenuation_curves.png")
+    print(f"\nAttenuation curves saved to {path}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,108 @@
+import functools
+import numpy as np
+
+
+class RecordView:
+    """
+    Slotted view of one row of a RecordTable
+
+    Fields read and write through to the table's structured array; scalar
+    fields come back as Python scalars, sub-array fields as array views.
+    Rows also support row['field'], so code written against the old
+    per-row dicts keeps working.
+    """
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        self._table = table
+        self._index = index
+
+    def __getitem__(self, name):
+        if name not in self._table.data.dtype.names:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def keys(self):
+        return self._table.data.dtype.names
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.keys()}
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.keys())
+        return f"{type(self).__name__}({fields})"
+
+
+def _field_property(name, subarray):
+    if subarray:
+        def get(self):
+            return self._table.data[name][self._index]
+    else:
+        def get(self):
+            return self._table.data[name][self._index].item()
+
+    def set(self, value):
+        self._table.data[name][self._index] = value
+    return property(get, set)
+
+
+@functools.lru_cache(maxsize=None)
+def row_type(dtype, base=RecordView):
+    """Row view class of a record layout, with one property per field"""
+    properties = {name: _field_property(name, bool(dtype.fields[name][0].shape))
+                  for name in dtype.names if not hasattr(base, name)}
+    return type(base.__name__, (base,), {'__slots__': (), **properties})
+
+
+class RecordTable:
+    """
+    Struct-of-arrays table over a NumPy structured array
+
+    Columns are plain arrays (column('density')) and rows are slotted
+    views built on access, so a table of a million records costs its
+    array and nothing per record. Indexing with an integer gives a row;
+    with a slice, mask or index array it gives a table of the selected
+    records.
+    """
+    row_base = RecordView
+
+    def __init__(self, data):
+        self.data = np.asarray(data)
+        self._row = row_type(self.data.dtype, self.row_base)
+
+    @classmethod
+    def from_records(cls, records, dtype):
+        """Table from an iterable of dicts (or rows) with the dtype's field names"""
+        records = list(records)
+        data = np.zeros(len(records), dtype=dtype)
+        for name in data.dtype.names:
+            data[name] = [record[name] for record in records]
+        return cls(data)
+
+    def _subset(self, data):
+        return type(self)(data)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, index):
+        if isinstance(index, (int, np.integer)):
+            if not -len(self.data) <= index < len(self.data):
+                raise IndexError(index)
+            return self._row(self, index % len(self.data))
+        return self._subset(self.data[index])
+
+    def __iter__(self):
+        return (self._row(self, i) for i in range(len(self.data)))
+
+    def column(self, name):
+        return self.data[name]
+
+    def to_records(self):
+        """List of plain dicts, the per-row layout used before tables"""
+        columns = {name: self.data[name].tolist() for name in self.data.dtype.names}
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes
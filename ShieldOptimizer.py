@@ -0,0 +1,241 @@
+import numpy as np
+from itertools import combinations
+from RadiationShield import RadiationShield
+from Instrumentation import instrument
+
+
+def _dominated(points, others):
+    """Rows of `points` dominated by at least one row of `others` (all objectives minimized)"""
+    if len(points) == 0 or len(others) == 0:
+        return np.zeros(len(points), dtype=bool)
+    le = (others[None, :, :] <= points[:, None, :]).all(axis=2)
+    lt = (others[None, :, :] < points[:, None, :]).any(axis=2)
+    return (le & lt).any(axis=1)
+
+
+def pareto_mask(objectives, max_block_elements=2**22):
+    """
+    Boolean mask of the non-dominated rows of an (n, k) objective array,
+    all objectives minimized. Duplicate rows keep only their first occurrence.
+
+    Rows are swept in order of the first objective, so each block only has
+    to be compared against the front found so far and against itself.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n, k = objectives.shape
+    mask = np.zeros(n, dtype=bool)
+    if n == 0:
+        return mask
+
+    _, first = np.unique(objectives, axis=0, return_index=True)
+    order = first[np.lexsort(objectives[first].T[::-1])]
+    front = np.empty((0, k))
+    kept = []
+
+    start = 0
+    while start < len(order):
+        block_size = max(1, min(1024, max_block_elements // max(1, len(front) * k)))
+        block_idx = order[start:start + block_size]
+        block = objectives[block_idx]
+        alive = ~_dominated(block, front)
+        block_idx, block = block_idx[alive], block[alive]
+        alive = ~_dominated(block, block)
+        kept.append(block_idx[alive])
+        front = np.vstack([front, block[alive]])
+        start += block_size
+
+    mask[np.concatenate(kept)] = True
+    return mask
+
+
+def _search_combination(combo, mu_rho, cost_per_cm3, density, grid, required_depth, area_cm2):
+    """
+    Pareto-optimal stacks for one ordered combination of materials.
+
+    Layers are added one at a time; after every intermediate layer the
+    partial stacks that are dominated in (cost, weight, thickness,
+    -optical depth) are dropped. The last layer is not enumerated over the
+    whole grid: each partial stack only gets the thinnest grid value that
+    reaches the required optical depth.
+    """
+    combo = np.asarray(combo)
+    step = grid[1] - grid[0] if len(grid) > 1 else grid[0]
+
+    # Partial stacks: per-layer thicknesses and running totals
+    layers = np.zeros((1, 0))
+    depth = np.zeros(1)
+    cost = np.zeros(1)
+    weight = np.zeros(1)
+    thickness = np.zeros(1)
+
+    for m in combo[:-1]:
+        layers = np.hstack([
+            np.repeat(layers, len(grid), axis=0),
+            np.tile(grid, len(layers))[:, None]
+        ])
+        depth = (depth[:, None] + mu_rho[m] * grid).ravel()
+        cost = (cost[:, None] + cost_per_cm3[m] * grid * area_cm2).ravel()
+        weight = (weight[:, None] + density[m] * grid * area_cm2 / 1000).ravel()
+        thickness = (thickness[:, None] + grid).ravel()
+
+        # Stacks that already meet the target need no further layer
+        useful = depth < required_depth
+        layers, depth, cost, weight, thickness = (
+            layers[useful], depth[useful], cost[useful], weight[useful], thickness[useful]
+        )
+        keep = pareto_mask(np.column_stack([cost, weight, thickness, -depth]))
+        layers, depth, cost, weight, thickness = (
+            layers[keep], depth[keep], cost[keep], weight[keep], thickness[keep]
+        )
+
+    # Close every partial stack with the thinnest sufficient last layer
+    last = combo[-1]
+    needed = (required_depth - depth) / mu_rho[last]
+    last_cm = grid[0] + np.maximum(np.ceil((needed - grid[0]) / step - 1e-9), 0) * step
+    feasible = last_cm <= grid[-1] + 1e-9
+    layers = np.hstack([layers, last_cm[:, None]])[feasible]
+    cost = (cost + cost_per_cm3[last] * last_cm * area_cm2)[feasible]
+    weight = (weight + density[last] * last_cm * area_cm2 / 1000)[feasible]
+    thickness = (thickness + last_cm)[feasible]
+
+    keep = pareto_mask(np.column_stack([cost, weight, thickness]))
+    return combo, layers[keep], cost[keep], weight[keep], thickness[keep]
+
+
+def _search_combination_job(args):
+    return _search_combination(*args)
+
+
+@instrument('pareto_front', 'cheapest', 'lightest')
+class CompositeShieldOptimizer:
+    """
+    Search layered shields (e.g. lead + concrete + water) for the stacks
+    that meet a target intensity with the best cost/weight/thickness trade-off
+    """
+
+    def __init__(self, shield=None, max_layers=3, thickness_step=1.0,
+                 max_layer_thickness=100.0, area_cm2=100 * 100):
+        self.shield = shield if shield is not None else RadiationShield()
+        self.max_layers = max_layers
+        self.thickness_step = thickness_step
+        self.max_layer_thickness = max_layer_thickness
+        self.area_cm2 = area_cm2  # Defaults to a 1m x 1m shield, as in compare_materials
+
+    def thickness_grid(self):
+        """Allowed thicknesses of a single layer in cm"""
+        return np.arange(1, int(round(self.max_layer_thickness / self.thickness_step)) + 1) \
+            * self.thickness_step
+
+    def pareto_front(self, initial_intensity, target_intensity, materials=None, max_workers=None):
+        """
+        Cost/weight/thickness Pareto front of layered stacks reaching the target
+
+        Parameters:
+        initial_intensity: Initial radiation intensity
+        target_intensity: Maximum acceptable intensity behind the stack
+        materials: Material names to consider (default: all)
+        max_workers: Fan the material combinations out over this many
+                     processes; None or 1 searches in-process
+
+        Returns:
+        List of stack dicts sorted by cost
+        """
+        names = list(self.shield.materials) if materials is None else list(materials)
+        index, density, mu, cost_per_cm3 = self.shield._material_arrays()
+        rows = np.array([index[name] for name in names], dtype=np.intp)
+        mu_rho = (mu * density)[rows]
+        density, cost_per_cm3 = density[rows], cost_per_cm3[rows]
+
+        required_depth = np.log(initial_intensity / target_intensity)
+        grid = self.thickness_grid()
+
+        jobs = [
+            (combo, mu_rho, cost_per_cm3, density, grid, required_depth, self.area_cm2)
+            for n_layers in range(1, min(self.max_layers, len(names)) + 1)
+            for combo in combinations(range(len(names)), n_layers)
+        ]
+
+        if max_workers is None or max_workers == 1:
+            results = map(_search_combination_job, jobs)
+            return self._merge(results, names, initial_intensity)
+
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            chunksize = max(1, len(jobs) // (4 * max_workers))
+            results = pool.map(_search_combination_job, jobs, chunksize=chunksize)
+            return self._merge(results, names, initial_intensity)
+
+    def _merge(self, results, names, initial_intensity):
+        """Combine per-combination fronts into the global Pareto front"""
+        stacks, costs, weights, thicknesses = [], [], [], []
+        for combo, layers, cost, weight, thickness in results:
+            for row in layers:
+                stacks.append((combo, row))
+            costs.append(cost)
+            weights.append(weight)
+            thicknesses.append(thickness)
+
+        if not stacks:
+            return []
+
+        cost = np.concatenate(costs)
+        weight = np.concatenate(weights)
+        thickness = np.concatenate(thicknesses)
+        keep = np.flatnonzero(pareto_mask(np.column_stack([cost, weight, thickness])))
+        keep = keep[np.argsort(cost[keep], kind='stable')]
+
+        front = []
+        for i in keep:
+            combo, layers = stacks[i]
+            stack_names = [names[m] for m in combo]
+            # Beer-Lambert through each layer in turn
+            final_intensity = initial_intensity
+            for name, layer_cm in zip(stack_names, layers):
+                final_intensity = self.shield.calculate_attenuation(final_intensity, name, layer_cm)
+            front.append({
+                'materials': tuple(stack_names),
+                'layers_cm': tuple(float(x) for x in layers),
+                'thickness_cm': thickness[i],
+                'cost_usd': cost[i],
+                'weight_kg': weight[i],
+                'final_intensity': final_intensity
+            })
+        return front
+
+    def cheapest(self, initial_intensity, target_intensity, **kwargs):
+        """Cheapest stack that meets the target intensity"""
+        front = self.pareto_front(initial_intensity, target_intensity, **kwargs)
+        return min(front, key=lambda s: s['cost_usd']) if front else None
+
+    def lightest(self, initial_intensity, target_intensity, **kwargs):
+        """Lightest stack that meets the target intensity"""
+        front = self.pareto_front(initial_intensity, target_intensity, **kwargs)
+        return min(front, key=lambda s: s['weight_kg']) if front else None
+
+
+def main():
+    optimizer = CompositeShieldOptimizer(max_layers=3, thickness_step=1.0)
+
+    initial_intensity = 1000
+    target_intensity = 1
+
+    print("Composite Shield Pareto Front")
+    print("=============================")
+    front = optimizer.pareto_front(initial_intensity, target_intensity)
+
+    print("\n{:<30} {:<20} {:<15} {:<15} {:<15}".format(
+        "Stack", "Layers (cm)", "Thickness (cm)", "Weight (kg)", "Cost (USD)"
+    ))
+    print("-" * 95)
+    for stack in front:
+        print("{:<30} {:<20} {:<15.2f} {:<15.2f} {:<15.2f}".format(
+            "+".join(stack['materials']),
+            "+".join(f"{x:g}" for x in stack['layers_cm']),
+            stack['thickness_cm'],
+            stack['weight_kg'],
+            stack['cost_usd']
+        ))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+# Slot layout of SharedMemoryCache; key 0 marks an empty slot
+SLOT_DTYPE = np.dtype([
+    ('key', 'u8'),        # 64-bit digest of the cache key
+    ('value', 'f8'),
+    ('check', 'u8'),      # key ^ value bits; a torn or racing write fails the check
+    ('last_used', 'u8')   # time.monotonic_ns() of the last hit or store
+])
+HEADER_DTYPE = np.dtype([('hits', 'u8'), ('misses', 'u8'), ('evictions', 'u8')])
+
+
+def key_digest(key):
+    """Stable 64-bit digest of a cache key, identical in every process"""
+    digest = int.from_bytes(hashlib.blake2b(repr(key).encode(), digest_size=8).digest(), 'little')
+    return digest or 1
+
+
+def array_digest(*arrays):
+    """Short digest of array contents, for cache keys that depend on tables"""
+    h = hashlib.blake2b(digest_size=16)
+    for a in arrays:
+        h.update(b'-' if a is None else np.ascontiguousarray(a, dtype=float).tobytes())
+    return h.hexdigest()
+
+
+class LRUCache:
+    """
+    Bounded in-process cache with least-recently-used eviction.
+
+    Keys should contain every input the cached value depends on (including
+    the material or isotope data), so a mutated entry simply stops
+    matching and its stale results age out.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, compute):
+        """Cached value for key, calling compute() on a miss"""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self._entries), 'maxsize': self.maxsize}
+
+    def __getstate__(self):
+        # Locks cannot be pickled; the copy gets its own
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+
+class SharedMemoryCache:
+    """
+    Float-valued cache in a shared-memory block that worker processes attach
+    to by name, so one warm cache serves a whole process pool.
+
+    The block is a set-associative table: a key hashes to one bucket of
+    `ways` slots and evicts the bucket's least recently used slot. There is
+    no cross-process lock; every slot carries a check word, so a torn read
+    is seen as a miss and the value is recomputed. Hit/miss counters are
+    shared and approximate under contention.
+    """
+
+    def __init__(self, slots=4096, ways=8, name=None, create=True):
+        from multiprocessing import shared_memory
+
+        self.ways = ways
+        self.buckets = max(1, slots // ways)
+        size = HEADER_DTYPE.itemsize + self.buckets * ways * SLOT_DTYPE.itemsize
+        if create:
+            self._shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+            self._shm.buf[:size] = bytes(size)
+        else:
+            try:
+                self._shm = shared_memory.SharedMemory(name=name, track=False)
+            except TypeError:
+                # Python < 3.13 always tracks; pool workers share the creator's
+                # resource tracker, so this only re-registers the same block
+                self._shm = shared_memory.SharedMemory(name=name)
+        self.owner = create
+        self._header = np.ndarray(1, dtype=HEADER_DTYPE, buffer=self._shm.buf)
+        self._slots = np.ndarray((self.buckets, ways), dtype=SLOT_DTYPE, buffer=self._shm.buf,
+                                 offset=HEADER_DTYPE.itemsize)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @classmethod
+    def attach(cls, name, slots=4096, ways=8):
+        """Open a cache created by another process"""
+        return cls(slots, ways, name=name, create=False)
+
+    def __reduce__(self):
+        # Worker processes receive an attachment, not a copy
+        return SharedMemoryCache.attach, (self.name, self.buckets * self.ways, self.ways)
+
+    @staticmethod
+    def _check(key, value):
+        return key ^ int(np.float64(value).view(np.uint64))
+
+    def get(self, key, compute):
+        """Cached float for key, calling compute() on a miss"""
+        digest = key_digest(key)
+        bucket = self._slots[digest % self.buckets]
+        header = self._header[0]
+        for slot in range(self.ways):
+            entry = bucket[slot]
+            if int(entry['key']) == digest:
+                value = float(entry['value'])
+                if int(entry['check']) == self._check(digest, value) and int(entry['key']) == digest:
+                    bucket['last_used'][slot] = time.monotonic_ns()
+                    header['hits'] += 1
+                    return value
+        header['misses'] += 1
+
+        value = float(compute())
+        slot = int(np.argmin(bucket['last_used']))
+        if bucket['key'][slot]:
+            header['evictions'] += 1
+        bucket['key'][slot] = 0
+        bucket['value'][slot] = value
+        bucket['check'][slot] = self._check(digest, value)
+        bucket['last_used'][slot] = time.monotonic_ns()
+        bucket['key'][slot] = digest
+        return value
+
+    def clear(self):
+        self._slots[...] = 0
+
+    def stats(self):
+        header = self._header[0]
+        return {'hits': int(header['hits']), 'misses': int(header['misses']),
+                'evictions': int(header['evictions']),
+                'size': int(np.count_nonzero(self._slots['key'])),
+                'maxsize': self._slots.size}
+
+    def close(self):
+        """Detach; the creating process also frees the block"""
+        del self._header, self._slots
+        self._shm.close()
+        if self.owner:
+            self._shm.unlink()
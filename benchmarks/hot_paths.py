@@ -0,0 +1,315 @@
+"""
+Throughput, peak memory and scaling of the calculator hot paths
+
+Every benchmark is run at several input sizes n. For each size the best of
+N timed runs gives the throughput in items per second, one extra run under
+tracemalloc gives the peak Python-heap allocation, and a log-log fit of
+time against n gives the scaling exponent (1.0 is linear).
+
+Usage:
+    python benchmarks/hot_paths.py [--repeat N] [--filter TEXT] [--quick]
+                                   [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+DEFAULT_SIZES = [100, 1_000, 10_000]
+QUICK_SIZES = [10, 100, 1_000]
+
+# Benchmark name -> (setup, sizes); setup(n) returns a zero-argument callable
+# that processes n items
+BENCHMARKS = {}
+
+
+def benchmark(name, sizes=None, quick_sizes=None):
+    """Register setup(n) under a benchmark name"""
+    def register(setup):
+        BENCHMARKS[name] = (setup, sizes or DEFAULT_SIZES, quick_sizes or QUICK_SIZES)
+        return setup
+    return register
+
+
+def _rng():
+    return np.random.default_rng(0)
+
+
+@benchmark("RadiationShield.calculate_attenuation")
+def _attenuation(n):
+    from RadiationShield import RadiationShield
+    shield = RadiationShield()
+    names = list(shield.materials)
+    rng = _rng()
+    materials = [names[i] for i in rng.integers(len(names), size=n)]
+    thicknesses = rng.uniform(0, 50, n).tolist()
+    return lambda: [shield.calculate_attenuation(1000.0, m, x) for m, x in zip(materials, thicknesses)]
+
+
+@benchmark("RadiationShield.calculate_attenuation_batch", sizes=[1_000, 100_000, 1_000_000],
+           quick_sizes=[1_000, 10_000, 100_000])
+def _attenuation_batch(n):
+    from RadiationShield import RadiationShield
+    shield = RadiationShield()
+    names = np.array(list(shield.materials))
+    rng = _rng()
+    materials = names[rng.integers(len(names), size=n)]
+    thicknesses = rng.uniform(0, 50, n)
+    intensities = rng.uniform(1, 1000, n)
+    return lambda: shield.calculate_attenuation_batch(intensities, materials, thicknesses)
+
+
+@benchmark("RadiationShield.compare_materials", sizes=[10, 100, 1_000])
+def _compare_materials(n):
+    from RadiationShield import RadiationShield
+    shield = RadiationShield()
+    targets = _rng().uniform(0.1, 100, n).tolist()
+    return lambda: [shield.compare_materials(1000.0, target) for target in targets]
+
+
+@benchmark("IsotopeDecayCalculator.calculate_decay", sizes=[1_000, 100_000, 1_000_000],
+           quick_sizes=[1_000, 10_000, 100_000])
+def _decay(n):
+    from IsotopeDecayCalculator import IsotopeDecayCalculator
+    calc = IsotopeDecayCalculator()
+    times = np.linspace(0, 100, n)
+    return lambda: calc.calculate_decay(1000.0, 6.01, times)
+
+
+@benchmark("NuclearPhysicsCalculator.calculate_water_temperature_rise")
+def _water(n):
+    from NuclearPhysicsCalculator import NuclearPhysicsCalculator
+    calc = NuclearPhysicsCalculator()
+    energies = _rng().uniform(0, 5e6, n).tolist()
+    return lambda: [calc.calculate_water_temperature_rise(e, 1.0) for e in energies]
+
+
+@benchmark("NuclearPhysicsCalculator.calculate_water_temperature_rise_batch",
+           sizes=[1_000, 100_000, 1_000_000], quick_sizes=[1_000, 10_000, 100_000])
+def _water_batch(n):
+    from NuclearPhysicsCalculator import NuclearPhysicsCalculator
+    calc = NuclearPhysicsCalculator()
+    energies = _rng().uniform(0, 5e6, n)
+    return lambda: calc.calculate_water_temperature_rise_batch(energies, 1.0)
+
+
+def _population_params():
+    from DemographicCalculator import PopulationParams
+    return PopulationParams(
+        base_mortality_rate=0.01, life_expectancy=75.0, population_size=1_000_000,
+        age_distribution={'0-14': 0.25, '15-24': 0.15, '25-54': 0.35, '55-64': 0.15, '65+': 0.10},
+        healthcare_access=0.8, infrastructure_quality=0.75
+    )
+
+
+@benchmark("DemographicCalculator.calculate_population_metrics")
+def _population_metrics(n):
+    from DemographicCalculator import DemographicCalculator
+    calc = DemographicCalculator(_population_params())
+    return lambda: [calc.calculate_population_metrics() for _ in range(n)]
+
+
+@benchmark("DemographicCalculator.population_metrics_batch", sizes=[1_000, 100_000, 1_000_000],
+           quick_sizes=[1_000, 10_000, 100_000])
+def _population_metrics_batch(n):
+    from DemographicCalculator import population_metrics_batch
+    params = _population_params()
+    rng = _rng()
+    groups = list(params.age_distribution)
+    mortality = rng.uniform(0.005, 0.02, n)
+    healthcare = rng.uniform(0, 1, n)
+    infrastructure = rng.uniform(0, 1, n)
+    sizes = np.full(n, params.population_size)
+    shares = np.tile(list(params.age_distribution.values()), (n, 1))
+    return lambda: population_metrics_batch(mortality, healthcare, infrastructure, sizes, shares, groups)
+
+
+@benchmark("GoldEnergyConverter.generate_report")
+def _gold_report(n):
+    from GoldEnergyConverter import GoldEnergyConverter
+    converter = GoldEnergyConverter()
+    rng = _rng()
+    gold = rng.uniform(1800, 3000, n).tolist()
+    oil = rng.uniform(60, 120, n).tolist()
+    return lambda: [converter.generate_report(8133.5, g, o) for g, o in zip(gold, oil)]
+
+
+@benchmark("GoldEnergyConverter.convert_batch", sizes=[1_000, 100_000, 1_000_000],
+           quick_sizes=[1_000, 10_000, 100_000])
+def _gold_batch(n):
+    from GoldEnergyConverter import GoldEnergyConverter
+    converter = GoldEnergyConverter()
+    rng = _rng()
+    gold = rng.uniform(1800, 3000, n)
+    oil = rng.uniform(60, 120, n)
+    return lambda: converter.convert_batch(8133.5, gold, oil)
+
+
+@benchmark("compute_worldline_observer (cached worldline)", sizes=[1_000, 10_000, 100_000],
+           quick_sizes=[100, 1_000, 10_000])
+def _worldline_query(n):
+    from compute_worldline_observer import compute_worldline_observer, compute_worldline_computer
+    t = np.linspace(0, 80, n)
+    compute_worldline_observer(t)
+    compute_worldline_computer(t)
+    return lambda: (compute_worldline_observer(t), compute_worldline_computer(t))
+
+
+@benchmark("integrate_geodesics", sizes=[100, 1_000, 10_000], quick_sizes=[10, 100, 1_000])
+def _geodesics(n):
+    from compute_worldline_observer import DEFAULT_METRIC, integrate_geodesics
+    r0 = np.linspace(6.0, 12.0, n)
+    return lambda: integrate_geodesics(DEFAULT_METRIC, r0, 0.0, tau_max=40.0)
+
+
+@benchmark("SlabTransport.simulate", sizes=[10_000, 100_000, 1_000_000],
+           quick_sizes=[1_000, 10_000, 100_000])
+def _slab_transport(n):
+    from PhotonTransport import SlabTransport
+    transport = SlabTransport(batch_size=250_000)
+    return lambda: transport.simulate([("lead", 5.0)], 1.25, histories=n)
+
+
+@benchmark("SlabTransport.simulate (scattering)", sizes=[10_000, 100_000, 1_000_000],
+           quick_sizes=[1_000, 10_000, 100_000])
+def _slab_transport_scattering(n):
+    # Photons scatter many times in thick concrete, so each history takes more steps
+    from PhotonTransport import SlabTransport
+    transport = SlabTransport(batch_size=250_000)
+    return lambda: transport.simulate([("concrete", 30.0)], 1.25, histories=n)
+
+
+@benchmark("DoseMapEngine.compute", sizes=[4_096, 32_768, 262_144],
+           quick_sizes=[512, 4_096, 32_768])
+def _dose_map(n):
+    from DoseMap import DoseMapEngine, PointSource, ShieldBox, VoxelGrid
+    side = round(n ** (1 / 3))
+    grid = VoxelGrid((0.0, 0.0, 0.0), (1000.0 / side,) * 3, (side,) * 3)
+    rng = _rng()
+    sources = [PointSource(tuple(p), 1e9, 0.662) for p in rng.uniform(0, 300, (8, 3))]
+    boxes = [ShieldBox.slab("concrete", 0, 400.0, 450.0),
+             ShieldBox("lead", (600.0, 600.0, 0.0), (650.0, 900.0, 300.0))]
+    engine = DoseMapEngine()
+    return lambda: engine.compute(grid, sources, boxes)
+
+
+@benchmark("DecayShieldingPipeline.transmitted_intensity", sizes=[1_000, 10_000, 100_000],
+           quick_sizes=[100, 1_000, 10_000])
+def _decay_shielding(n):
+    from DecayShielding import DecayShieldingPipeline
+    pipeline = DecayShieldingPipeline()
+    inventory = {"Tc-99m": 1000.0, "I-131": 200.0, "Mo-99": 500.0}
+    layers = [("lead", np.linspace(0, 10, 64))]
+    times = np.linspace(0, 96, n)
+    return lambda: pipeline.transmitted_intensity(inventory, layers, times)
+
+
+def measure(name, sizes, repeat):
+    """Timing and peak memory of one benchmark at every size"""
+    setup = BENCHMARKS[name][0]
+    points = []
+    for n in sizes:
+        run = setup(n)
+        run()  # Warm caches and lazy imports
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        tracemalloc.start()
+        run()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        best = min(times)
+        points.append({
+            "n": n,
+            "best_s": best,
+            "median_s": float(np.median(times)),
+            "items_per_s": n / best if best > 0 else float("inf"),
+            "peak_memory_bytes": peak,
+        })
+
+    n = np.array([p["n"] for p in points], dtype=float)
+    t = np.array([p["best_s"] for p in points])
+    exponent = float(np.polyfit(np.log(n), np.log(t), 1)[0]) if len(points) > 1 else None
+    return {"name": name, "points": points, "scaling_exponent": exponent}
+
+
+def git_commit():
+    """HEAD commit of the repository, or None outside a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline_path, threshold):
+    """Print time ratios against a baseline JSON file; return the regressions"""
+    with open(baseline_path) as f:
+        baseline = {r["name"]: {p["n"]: p for p in r["points"]} for r in json.load(f)["results"]}
+    regressions = []
+    print(f"\nComparison with {baseline_path} (ratio = new / old best time)")
+    print("{:<62} {:>9} {:>8}".format("Benchmark", "n", "Ratio"))
+    print("-" * 81)
+    for result in results:
+        old_points = baseline.get(result["name"], {})
+        for point in result["points"]:
+            old = old_points.get(point["n"])
+            if old is None:
+                continue
+            ratio = point["best_s"] / old["best_s"]
+            flag = "  <-- slower" if ratio > 1 + threshold else ""
+            print("{:<62} {:>9} {:>8.2f}{}".format(result["name"], point["n"], ratio, flag))
+            if flag:
+                regressions.append((result["name"], point["n"], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per size (best is kept)")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--quick", action="store_true", help="use the smaller size set")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON from an earlier run")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown reported as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    names = [name for name in BENCHMARKS if args.filter in name]
+    results = []
+    print("{:<62} {:>9} {:>14} {:>12}".format("Benchmark", "n", "Items/s", "Peak (KiB)"))
+    print("-" * 100)
+    for name in names:
+        _, sizes, quick_sizes = BENCHMARKS[name]
+        result = measure(name, quick_sizes if args.quick else sizes, args.repeat)
+        results.append(result)
+        for point in result["points"]:
+            print("{:<62} {:>9} {:>14,.0f} {:>12,.1f}".format(
+                name, point["n"], point["items_per_s"], point["peak_memory_bytes"] / 1024
+            ))
+        if result["scaling_exponent"] is not None:
+            print("{:<62} {:>9} {:>14}".format("", "scaling", f"n^{result['scaling_exponent']:.2f}"))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": sys.version, "numpy": np.__version__, "commit": git_commit(),
+                       "results": results}, f, indent=2)
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
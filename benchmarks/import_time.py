@@ -0,0 +1,99 @@
+"""
+Cold-start import cost of each calculator entry point
+
+Runs `python -X importtime -c "import <module>"` in a fresh interpreter for
+every entry point and records the cumulative import time of the module
+itself, the wall time of the whole interpreter start, and the heaviest
+imports it pulled in.
+
+Usage:
+    python benchmarks/import_time.py [--repeat N] [--output results.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = [
+    "RadiationShield",
+    "IsotopeDecayCalculator",
+    "NuclearPhysicsCalculator",
+    "DemographicCalculator",
+    "GoldEnergyConverter",
+    "ShieldOptimizer",
+    "NuclideDataStore",
+    "PlanckUnits",
+    "PhotonTransport",
+    "DoseMap",
+    "DecayShielding",
+    "CalculationService",
+    "RecordTables",
+]
+
+# Dependencies that should only load when plotting or statistics are used
+HEAVY_MODULES = ["matplotlib", "scipy", "pandas", "pyarrow"]
+
+
+def parse_importtime(stderr):
+    """Map module name -> (self_us, cumulative_us) from -X importtime output"""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure(module, repeat):
+    """Best-of-N cold import of one module"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        )
+        wall_ms = (time.perf_counter() - start) * 1000
+        timings = parse_importtime(result.stderr)
+        if best is None or wall_ms < best["wall_ms"]:
+            heaviest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:10]
+            best = {
+                "module": module,
+                "wall_ms": wall_ms,
+                "import_ms": timings[module][1] / 1000,
+                "heavy_imports": sorted(
+                    name for name in timings if name.split(".")[0] in HEAVY_MODULES
+                    and "." not in name
+                ),
+                "heaviest_self_ms": {name: t[0] / 1000 for name, t in heaviest},
+            }
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5, help="runs per entry point (best is kept)")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = [measure(module, args.repeat) for module in ENTRY_POINTS]
+
+    print("{:<26} {:>10} {:>10}  {}".format("Entry point", "Wall (ms)", "Import (ms)", "Heavy imports"))
+    print("-" * 70)
+    for r in results:
+        print("{:<26} {:>10.1f} {:>10.1f}  {}".format(
+            r["module"], r["wall_ms"], r["import_ms"], ", ".join(r["heavy_imports"]) or "-"
+        ))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"python": sys.version, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Latency against throughput of the batched calculation service
+
+Requests arrive open-loop as a Poisson process at each offered rate. The
+latency of a request is measured from its scheduled arrival, so time spent
+waiting behind a full queue counts against it. By default the service
+runs in this process and is called through InProcessClient; with --connect
+the requests go to a running `python CalculationService.py --serve`.
+
+Usage:
+    python benchmarks/service_load.py [--rates 1000 5000 20000] [--duration 2]
+                                      [--ops attenuation decay ...]
+                                      [--process-workers N] [--connect HOST:PORT]
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CalculationService import CalculationService, InProcessClient, StreamClient, OPERATIONS
+
+AGE_DISTRIBUTION = {'0-14': 0.25, '15-24': 0.15, '25-54': 0.35, '55-64': 0.15, '65+': 0.10}
+
+
+def make_request(op, rng):
+    """Random arguments for one request of an operation"""
+    if op == 'attenuation':
+        return {'initial_intensity': 1000.0, 'material': str(rng.choice(['lead', 'concrete', 'water'])),
+                'thickness': float(rng.uniform(0, 50))}
+    if op == 'required_thickness':
+        return {'initial_intensity': 1000.0, 'target_intensity': float(rng.uniform(0.1, 100)),
+                'material': str(rng.choice(['lead', 'concrete', 'water']))}
+    if op == 'decay':
+        return {'initial_amount': 1000.0, 'half_life_hours': str(rng.choice(['Tc-99m', 'I-131', 'F-18'])),
+                'time_hours': float(rng.uniform(0, 100))}
+    if op == 'water_temperature_rise':
+        return {'energy_joules': float(rng.uniform(0, 5e6)), 'mass_kg': 1.0}
+    if op == 'population_metrics':
+        return {'base_mortality_rate': float(rng.uniform(0.005, 0.02)), 'population_size': 1_000_000,
+                'age_distribution': AGE_DISTRIBUTION, 'healthcare_access': float(rng.uniform(0, 1)),
+                'infrastructure_quality': float(rng.uniform(0, 1))}
+    return {'gold_reserves': 8133.5, 'gold_price': float(rng.uniform(1800, 3000)),
+            'oil_price': float(rng.uniform(60, 120))}
+
+
+async def run_rate(client, rate, duration, ops, rng):
+    """Offer `rate` requests per second for `duration` seconds"""
+    loop = asyncio.get_running_loop()
+    n = max(1, int(rate * duration))
+    chosen = rng.choice(ops, size=n)
+    requests = [(str(op), make_request(op, rng)) for op in chosen]
+    latencies = np.empty(n)
+    errors = 0
+
+    async def one(i, arrival):
+        nonlocal errors
+        op, args = requests[i]
+        try:
+            await client.call(op, **args)
+        except Exception:
+            errors += 1
+        latencies[i] = loop.time() - arrival
+
+    start = loop.time()
+    arrivals = start + np.cumsum(rng.exponential(1 / rate, n))
+    tasks = []
+    for i, arrival in enumerate(arrivals.tolist()):
+        delay = arrival - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(one(i, arrival)))
+    await asyncio.gather(*tasks)
+    elapsed = loop.time() - start
+    return {
+        'offered': rate,
+        'throughput': n / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)) * 1000,
+        'p99_ms': float(np.percentile(latencies, 99)) * 1000,
+        'errors': errors
+    }
+
+
+async def run(args):
+    rng = np.random.default_rng(0)
+    service = None
+    if args.connect:
+        host, port = args.connect.rsplit(':', 1)
+        client = await StreamClient.connect(host, int(port))
+    else:
+        service = await CalculationService(batch_window=args.batch_window,
+                                           process_workers=args.process_workers).start()
+        client = InProcessClient(service)
+
+    print("{:>10} {:>12} {:>10} {:>10} {:>11} {:>7}".format(
+        "Offered/s", "Achieved/s", "p50 (ms)", "p99 (ms)", "Mean batch", "Errors"))
+    print("-" * 65)
+    try:
+        await run_rate(client, min(args.rates), 0.2, args.ops, rng)  # Warm up
+        for rate in args.rates:
+            before = {name: dict(s) for name, s in service.stats.items()} if service else {}
+            result = await run_rate(client, rate, args.duration, args.ops, rng)
+            if service:
+                requests = sum(s['requests'] - before.get(name, {}).get('requests', 0)
+                               for name, s in service.stats.items())
+                batches = sum(s['batches'] - before.get(name, {}).get('batches', 0)
+                              for name, s in service.stats.items())
+                mean_batch = f"{requests / max(batches, 1):.1f}"
+            else:
+                mean_batch = "-"
+            print("{:>10,} {:>12,.0f} {:>10.2f} {:>10.2f} {:>11} {:>7}".format(
+                rate, result['throughput'], result['p50_ms'], result['p99_ms'], mean_batch,
+                result['errors']))
+    finally:
+        if service:
+            await service.stop()
+        else:
+            await client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--rates", type=int, nargs="+", default=[1_000, 5_000, 20_000],
+                        help="offered request rates per second")
+    parser.add_argument("--duration", type=float, default=2.0, help="seconds per rate")
+    parser.add_argument("--ops", nargs="+", default=list(OPERATIONS), choices=list(OPERATIONS),
+                        help="operations to mix uniformly")
+    parser.add_argument("--batch-window", type=float, default=0.002,
+                        help="micro-batching window in seconds (in-process service only)")
+    parser.add_argument("--process-workers", type=int, default=None,
+                        help="process pool for CPU-heavy batches (in-process service only)")
+    parser.add_argument("--connect", help="HOST:PORT of a running service")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Memory and GC cost of dict-based results against the record tables
+
+For each size n this builds the same data twice: as PopulationParams plus
+calculate_population_metrics-style dicts of dicts (and a list of
+compare_materials-style dicts), and as a ScenarioTable (and a RecordTable
+of comparisons). It reports the retained Python-heap bytes (tracemalloc),
+the objects tracked by the garbage collector and the time of a full
+gc.collect() while the data is alive.
+
+Usage:
+    python benchmarks/table_memory.py [--sizes 10000 100000 1000000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+AGE_DISTRIBUTION = {'0-14': 0.25, '15-24': 0.15, '25-54': 0.35, '55-64': 0.15, '65+': 0.10}
+
+
+def _scenario_inputs(n):
+    rng = np.random.default_rng(0)
+    return rng.uniform(0.005, 0.02, n), rng.uniform(0, 1, n), rng.uniform(0, 1, n)
+
+
+def scenario_dicts(n):
+    """Per-scenario PopulationParams and metrics dicts, as the scalar API returns them"""
+    from DemographicCalculator import PopulationParams, ScenarioTable, population_metrics_table
+    mortality, healthcare, infrastructure = _scenario_inputs(n)
+    params = [PopulationParams(m, 75.0, 1_000_000, dict(AGE_DISTRIBUTION), h, i)
+              for m, h, i in zip(mortality.tolist(), healthcare.tolist(), infrastructure.tolist())]
+    # Same numbers as the scalar path, without n calculator objects
+    table = population_metrics_table(ScenarioTable.from_params(params))
+    metrics = table.metric_records()
+    del table
+    return params, metrics
+
+
+def scenario_table(n):
+    from DemographicCalculator import ScenarioTable, population_metrics_table
+    mortality, healthcare, infrastructure = _scenario_inputs(n)
+    table = ScenarioTable.empty(n, list(AGE_DISTRIBUTION))
+    table.data['base_mortality_rate'] = mortality
+    table.data['healthcare_access'] = healthcare
+    table.data['infrastructure_quality'] = infrastructure
+    table.data['life_expectancy'] = 75.0
+    table.data['population_size'] = 1_000_000
+    table.data['age_shares'] = list(AGE_DISTRIBUTION.values())
+    return population_metrics_table(table)
+
+
+def _targets(shield, n):
+    return np.random.default_rng(0).uniform(0.1, 100, n // len(shield.materials)).tolist()
+
+
+def comparison_dicts(n):
+    """n compare_materials result rows as dicts"""
+    from RadiationShield import RadiationShield
+    shield = RadiationShield()
+    return [row for t in _targets(shield, n) for row in shield.compare_materials(1000.0, t)]
+
+
+def comparison_table(n):
+    """The same rows gathered into one RecordTable"""
+    from RadiationShield import RadiationShield
+    from RecordTables import RecordTable
+    shield = RadiationShield()
+    return RecordTable(np.concatenate([shield.compare_materials(1000.0, t, as_table=True).data
+                                       for t in _targets(shield, n)]))
+
+
+CASES = {
+    'scenarios': (scenario_dicts, scenario_table),
+    'material comparisons': (comparison_dicts, comparison_table),
+}
+
+
+def measure(build, n):
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tracked_before = len(gc.get_objects())
+    data = build(n)
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    tracked = len(gc.get_objects()) - tracked_before
+    start = time.perf_counter()
+    gc.collect()
+    gc_seconds = time.perf_counter() - start
+    del data
+    return retained, tracked, gc_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print("{:<22} {:>9} {:>8} {:>14} {:>12} {:>10}".format(
+        "Case", "n", "Layout", "Retained (MiB)", "GC objects", "GC (ms)"))
+    print("-" * 80)
+    for case, (dicts, table) in CASES.items():
+        for n in args.sizes:
+            for layout, build in (("dicts", dicts), ("table", table)):
+                retained, tracked, gc_seconds = measure(build, n)
+                print("{:<22} {:>9,} {:>8} {:>14,.1f} {:>12,} {:>10.1f}".format(
+                    case, n, layout, retained / 2 ** 20, tracked, gc_seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
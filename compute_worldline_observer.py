@@ -1,82 +1,588 @@
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy.integrate import odeint
+from dataclasses import dataclass, field
+from PlotRenderer import figure, finish, plot_line
+
+@dataclass
+class ReissnerNordstrom:
+    """
+    Static charged black hole, f(r) = 1 - 2M/r + Q²/r², in geometric
+    units (G = c = 1). Q = 0 gives the Schwarzschild metric.
+    """
+    mass: float = 1.0
+    charge: float = 0.0
+
+    def f(self, r):
+        return 1 - 2 * self.mass / r + self.charge ** 2 / r ** 2
+
+    def df(self, r):
+        return 2 * self.mass / r ** 2 - 2 * self.charge ** 2 / r ** 3
+
+    @property
+    def horizons(self):
+        """(outer, inner) horizon radii; the inner one is 0 for Schwarzschild"""
+        if self.charge > self.mass:
+            return np.nan, np.nan  # Naked singularity
+        root = np.sqrt(self.mass ** 2 - self.charge ** 2)
+        return self.mass + root, self.mass - root
+
+    def tortoise(self, r):
+        """Tortoise coordinate r*(r), with dr*/dr = 1/f(r)"""
+        outer, inner = self.horizons
+        if not np.isfinite(outer):
+            raise ValueError("Tortoise coordinate requires a horizon (charge <= mass)")
+        r = np.asarray(r, dtype=float)
+        if outer == inner:  # Extremal hole
+            return r + 2 * self.mass * np.log(np.abs(r - self.mass)) - self.mass ** 2 / (r - self.mass)
+        return (r + outer ** 2 / (outer - inner) * np.log(np.abs(r - outer))
+                - inner ** 2 / (outer - inner) * np.log(np.abs(r - inner)))
+
+class Schwarzschild(ReissnerNordstrom):
+    """Uncharged black hole of mass M"""
+
+    def __init__(self, mass=1.0):
+        super().__init__(mass, 0.0)
+
+@dataclass
+class GeodesicBatch:
+    """
+    Equatorial timelike geodesics integrated together in proper time τ
+
+    The state of each trajectory is (v, r, φ, dr/dτ) where v = t + r* is
+    the ingoing Eddington-Finkelstein time, which stays finite across the
+    horizons. Every trajectory has its own adaptive steps and stops at its
+    own termination event; after that its state is held at the final value.
+    The accepted steps of all trajectories are stored back to back, sorted
+    by trajectory and then τ, with each step's dense-output polynomial.
+    """
+    metric: ReissnerNordstrom
+    energy: np.ndarray  # Conserved E per trajectory
+    angular_momentum: np.ndarray  # Conserved L per trajectory
+    tau_max: float
+    r_min: float  # Radius treated as the singularity
+    tau_end: np.ndarray  # Proper time at which each trajectory stopped
+    offsets: np.ndarray  # Steps of trajectory i are offsets[i]:offsets[i + 1]
+    step_tau: np.ndarray  # (n_steps,) start of each step
+    step_size: np.ndarray  # (n_steps,)
+    step_state: np.ndarray  # (n_steps, 4) state at the start of each step
+    step_poly: np.ndarray  # (n_steps, 4, 4) dense-output coefficients of θ, θ², θ³, θ⁴
+    events: dict = field(default_factory=dict)  # Event name -> τ per trajectory (NaN if never)
+    _worldlines: dict = field(default_factory=dict, init=False, repr=False)
+
+    def __len__(self):
+        return len(self.energy)
+
+    def _locate(self, rows, tau):
+        """Step of trajectory rows[k] containing tau[k], by vectorized bisection"""
+        low = self.offsets[rows]
+        high = self.offsets[rows + 1] - 1
+        while np.any(low < high):
+            mid = (low + high + 1) // 2
+            later = self.step_tau[mid] <= tau
+            low = np.where(later, mid, low)
+            high = np.where(later, high, mid - 1)
+        return low
+
+    def _dense(self, rows, tau):
+        """(4, len(rows)) states of trajectory rows[k] at tau[k], held after it stops"""
+        tau = np.clip(tau, 0.0, self.tau_end[rows])
+        k = self._locate(rows, tau)
+        return _dense_step(self.step_state[k], self.step_size[k], self.step_poly[k],
+                           (tau - self.step_tau[k]) / self.step_size[k]).T
+
+    def state(self, tau):
+        """Dense-output state at proper times tau: dict of (n_trajectories, *tau.shape) arrays"""
+        tau = np.atleast_1d(np.asarray(tau, dtype=float))
+        rows = np.repeat(np.arange(len(self)), tau.size)
+        values = self._dense(rows, np.tile(tau.ravel(), len(self))).reshape(4, len(self), *tau.shape)
+        return dict(zip(('v', 'r', 'phi', 'u'), values))
+
+    def radius(self, tau):
+        """r(τ) for every trajectory, shape (n_trajectories, *tau.shape)"""
+        return self.state(tau)['r']
+
+    def state_at(self, tau):
+        """State of trajectory i at its own proper time tau[i]: dict of (n_trajectories,) arrays"""
+        tau = np.broadcast_to(np.asarray(tau, dtype=float), (len(self),))
+        return dict(zip(('v', 'r', 'phi', 'u'), self._dense(np.arange(len(self)), tau)))
+
+    def worldline(self, index=0, samples_per_step=8):
+        """Trajectory `index` as a Worldline; its interpolant is built once and cached"""
+        key = (index, samples_per_step)
+        if key not in self._worldlines:
+            self._worldlines[key] = Worldline(self, index, samples_per_step)
+        return self._worldlines[key]
+
+def _geodesic_rhs(metric, energy, angular_momentum, y):
+    """d/dτ of the (rows, 4) states y = (v, r, φ, dr/dτ), one trajectory per row"""
+    r, u = y[:, 1], y[:, 3]
+    l2_r2 = angular_momentum ** 2 / r ** 2
+    return np.stack([
+        (1 + l2_r2) / (energy - u),
+        u,
+        angular_momentum / r ** 2,
+        -0.5 * metric.df(r) * (1 + l2_r2) + metric.f(r) * l2_r2 / r
+    ], axis=1)
+
+def _dense_step(y, h, poly, theta):
+    """State at fraction theta of steps starting at y with size h"""
+    powers = np.cumprod(np.repeat(np.asarray(theta, dtype=float)[:, None], 4, axis=1), axis=1)
+    return y + h[:, None] * np.einsum('skp,sp->sk', poly, powers)
+
+def _first_root(g, y, h, poly, iterations=60):
+    """
+    Fraction of each step at which g, positive at its start and not at its
+    end, first reaches zero (bisection on the dense output)
+    """
+    low, high = np.zeros(len(h)), np.ones(len(h))
+    for _ in range(iterations):
+        mid = 0.5 * (low + high)
+        above = g(_dense_step(y, h, poly, mid)) > 0
+        low = np.where(above, mid, low)
+        high = np.where(above, high, mid)
+    return high
+
+def _integrate_batch(metric, energy, angular_momentum, y0, tau_max, r_min, levels, rtol, atol):
+    """
+    Dormand-Prince 5(4) steps for all trajectories at once, each row with
+    its own step size and error control, so a stiff trajectory near the
+    singularity does not slow the others. Rows leave the batch at their
+    terminal event (r_min, or E - dr/dτ → 0 on the outgoing branch through
+    the inner horizon, where v → ∞) or at tau_max. Falling crossings of
+    the given radii are located on each step's dense output.
+
+    Returns:
+    (step rows, step τ, step sizes, step states, step polynomials, final τ,
+     first crossing τ per level (n, n_levels), τ at r_min or NaN)
+    """
+    from scipy.integrate import RK45  # Only for its Dormand-Prince tableau
+
+    a, b, e, p = RK45.A, RK45.B, RK45.E, RK45.P
+    n = len(energy)
+    levels = np.asarray(levels, dtype=float)
+    terminal = [
+        lambda y, rows: y[:, 1] - r_min,
+        lambda y, rows: energy[rows] - y[:, 3] - 1e-6 * energy[rows],
+    ]
+
+    def rhs(y, rows):
+        return _geodesic_rhs(metric, energy[rows], angular_momentum[rows], y)
+
+    def rms(x):
+        return np.sqrt(np.mean(x ** 2, axis=1))
+
+    tau = np.zeros(n)
+    y = np.array(y0, dtype=float)
+    tau_end = np.full(n, tau_max, dtype=float)
+    crossings = np.full((n, len(levels)), np.nan)
+    singularity = np.full(n, np.nan)
+
+    with np.errstate(all='ignore'):
+        # Initial step as in scipy's select_initial_step
+        rows = np.arange(n)
+        f = rhs(y, rows)
+        scale = atol + np.abs(y) * rtol
+        d0, d1 = rms(y / scale), rms(f / scale)
+        h0 = np.where((d0 < 1e-5) | (d1 < 1e-5), 1e-6, 0.01 * d0 / d1)
+        d2 = rms((rhs(y + h0[:, None] * f, rows) - f) / scale) / h0
+        h1 = np.where(np.maximum(d1, d2) <= 1e-15, np.maximum(1e-6, h0 * 1e-3),
+                      (0.01 / np.maximum(d1, d2)) ** 0.2)
+        h = np.minimum(np.minimum(100 * h0, h1), tau_max)
+
+        records = []
+        while len(rows):
+            t0, y_start, f_start = tau[rows], y[rows], f[rows]
+            last = t0 + h >= tau_max
+            step = np.where(last, tau_max - t0, h)
+            if np.any(step < 10 * np.spacing(t0)):
+                failed = rows[np.argmax(step < 10 * np.spacing(t0))]
+                raise RuntimeError(f"Geodesic integration failed: step size underflow "
+                                   f"for trajectory {failed}")
+
+            k = np.empty((len(rows), 7, 4))
+            k[:, 0] = f_start
+            for s in range(1, 6):
+                k[:, s] = rhs(y_start + step[:, None] * (k[:, :s].transpose(0, 2, 1) @ a[s, :s]),
+                              rows)
+            y_new = y_start + step[:, None] * (k[:, :6].transpose(0, 2, 1) @ b)
+            k[:, 6] = rhs(y_new, rows)
+            error = step[:, None] * (k.transpose(0, 2, 1) @ e)
+            norm = rms(error / (atol + np.maximum(np.abs(y_start), np.abs(y_new)) * rtol))
+            accepted = np.isfinite(norm) & (norm < 1) & np.isfinite(y_new).all(axis=1)
+
+            factor = np.where(np.isfinite(norm), 0.9 * norm ** -0.2, 0.2)
+            factor = np.clip(factor, 0.2, np.where(accepted, 10.0, 1.0))
+            h = step * factor
+            if not accepted.any():
+                continue
+
+            # Accepted steps: dense output and events
+            done = rows[accepted]
+            t_a, y_a, step_a = t0[accepted], y_start[accepted], step[accepted]
+            y_end = y_new[accepted]
+            poly = k[accepted].transpose(0, 2, 1) @ p
+            ended = last[accepted].copy()
+            theta_end = np.ones(len(done))
+            for event, g in enumerate(terminal):
+                hit = (g(y_a, done) > 0) & (g(y_end, done) <= 0)
+                if hit.any():
+                    theta = _first_root(lambda y_: g(y_, done[hit]),
+                                        y_a[hit], step_a[hit], poly[hit])
+                    earlier = theta < theta_end[hit]
+                    index = np.flatnonzero(hit)[earlier]
+                    theta_end[index] = theta[earlier]
+                    ended[index] = True
+                    # Only the earliest terminal event of a step counts
+                    singularity[done[index]] = (t_a[index] + theta[earlier] * step_a[index]
+                                                if event == 0 else np.nan)
+            for j, level in enumerate(levels):
+                hit = (y_a[:, 1] > level) & (y_end[:, 1] <= level) & np.isnan(crossings[done, j])
+                if hit.any():
+                    theta = _first_root(lambda y_: y_[:, 1] - level,
+                                        y_a[hit], step_a[hit], poly[hit])
+                    before = theta <= theta_end[hit]
+                    index = np.flatnonzero(hit)[before]
+                    crossings[done[index], j] = t_a[index] + theta[before] * step_a[index]
+
+            records.append((done, t_a, step_a, y_a, poly))
+            tau[done] = t_a + step_a
+            y[done] = y_end
+            f[done] = k[accepted, 6]
+            tau_end[done[ended]] = np.minimum(t_a[ended] + theta_end[ended] * step_a[ended],
+                                              tau_max)
+            keep = np.ones(len(rows), dtype=bool)
+            keep[np.flatnonzero(accepted)[ended]] = False
+            rows, h = rows[keep], h[keep]
+
+    steps = [np.concatenate(column) for column in zip(*records)]
+    records.clear()
+    # Sort by trajectory, then τ, one column at a time to bound the peak memory
+    order = np.lexsort((steps[1], steps[0]))
+    for i, column in enumerate(steps):
+        steps[i] = column[order]
+    return (*steps, tau_end, crossings, singularity)
+
+def _integrate_chunk(args):
+    """Process-pool entry point: integrate one chunk of trajectories"""
+    return _integrate_batch(*args)
+
+def integrate_geodesics(metric, r0, dr_dtau0, angular_momentum=0.0, tau_max=100.0,
+                        v0=0.0, phi0=0.0, r_min=None, rtol=1e-9, atol=1e-11,
+                        max_workers=None, chunk_size=10_000):
+    """
+    Integrate many equatorial timelike geodesics
+
+    All trajectories are advanced together as one vectorized system, each
+    with its own step size and termination events, so the cost of a step
+    is shared by the whole batch.
+
+    Parameters:
+    metric: ReissnerNordstrom or Schwarzschild instance
+    r0: Initial radii (array-like, outside the outer horizon)
+    dr_dtau0: Initial radial velocities dr/dτ (negative for infall)
+    angular_momentum: Conserved angular momentum per unit mass L
+    tau_max: Proper time to integrate to
+    v0, phi0: Initial advanced time and azimuth
+    r_min: Radius treated as the singularity (default 1e-3 M); trajectories
+           stop there, or when they leave through the inner horizon's
+           outgoing branch (v → ∞)
+    max_workers: Integrate chunks of chunk_size trajectories on this many
+                 processes; None or 1 integrates in-process as one batch
+
+    Returns:
+    GeodesicBatch with 'horizon', 'inner_horizon' and 'singularity' events
+    """
+    r0, u0, L, v0, phi0 = (np.array(a, dtype=float) for a in np.broadcast_arrays(
+        r0, dr_dtau0, angular_momentum, v0, phi0))
+    r0, u0, L, v0, phi0 = (np.atleast_1d(a) for a in (r0, u0, L, v0, phi0))
+    r_min = 1e-3 * metric.mass if r_min is None else r_min
+
+    # Conserved energy from the normalization u·u = -1
+    energy = np.sqrt(u0 ** 2 + metric.f(r0) * (1 + L ** 2 / r0 ** 2))
+
+    outer, inner = metric.horizons
+    levels = {name: level for name, level in (('horizon', outer), ('inner_horizon', inner))
+              if np.isfinite(level) and level > 0}
+    states = np.stack([v0, r0, phi0, u0], axis=1)
+    if max_workers not in (None, 1):
+        from concurrent.futures import ProcessPoolExecutor
+        starts = range(0, len(energy), chunk_size)
+        jobs = [(metric, energy[i:i + chunk_size], L[i:i + chunk_size], states[i:i + chunk_size],
+                 tau_max, r_min, list(levels.values()), rtol, atol) for i in starts]
+        with ProcessPoolExecutor(max_workers) as pool:
+            chunks = list(pool.map(_integrate_chunk, jobs))
+        # Chunk-local trajectory numbers become global ones
+        for start, chunk in zip(starts, chunks):
+            chunk[0][:] += start
+        columns = [np.concatenate(column) for column in zip(*chunks)]
+    else:
+        columns = _integrate_batch(metric, energy, L, states, tau_max, r_min,
+                                   list(levels.values()), rtol, atol)
+    step_rows, step_tau, step_size, step_state, step_poly, tau_end, crossings, singularity = columns
+
+    offsets = np.concatenate([[0], np.cumsum(np.bincount(step_rows, minlength=len(energy)))])
+    batch = GeodesicBatch(metric, energy, L, tau_max, r_min, tau_end, offsets,
+                          step_tau, step_size, step_state, step_poly)
+    for name in ('horizon', 'inner_horizon'):
+        batch.events[name] = crossings[:, list(levels).index(name)] if name in levels \
+            else np.full(len(batch), np.nan)
+    batch.events['singularity'] = singularity
+    return batch
+
+class Worldline:
+    """
+    One trajectory of a GeodesicBatch with its own cached interpolant
+
+    The trajectory's dense output is sampled `samples_per_step` times per
+    accepted step and joined by a cubic Hermite spline through the exact
+    geodesic derivatives. Past the end of the trajectory the state is held,
+    as in the batch.
+    """
+
+    def __init__(self, batch, index, samples_per_step=8):
+        from scipy.interpolate import CubicHermiteSpline
+
+        self.metric = batch.metric
+        self.energy = batch.energy[index]
+        self.angular_momentum = batch.angular_momentum[index]
+        self.tau_max = batch.tau_max
+        self.tau_end = batch.tau_end[index]
+
+        steps = np.append(batch.step_tau[batch.offsets[index]:batch.offsets[index + 1]],
+                          self.tau_end)
+        fractions = np.arange(samples_per_step) / samples_per_step
+        taus = np.append((steps[:-1, None] + np.diff(steps)[:, None] * fractions).ravel(), steps[-1])
+        states = batch._dense(np.full(len(taus), index), taus)
+        derivatives = _geodesic_rhs(self.metric, self.energy, self.angular_momentum, states.T).T
+        self.taus = taus
+        self.spline = CubicHermiteSpline(taus, states, derivatives, axis=1)
+        self._derivative = self.spline.derivative()
+        self._null_samples = {}
+
+    def state(self, tau):
+        """Interpolated state at proper times tau: dict of arrays shaped like tau"""
+        tau = np.minimum(np.asarray(tau, dtype=float), self.tau_end)
+        return dict(zip(('v', 'r', 'phi', 'u'), self.spline(tau)))
+
+    def radius(self, tau):
+        """r(τ) along this worldline"""
+        return self.state(tau)['r']
+
+    def null_coordinate(self, tau, direction='ingoing'):
+        """
+        Null coordinate carried by radial light rays through the worldline
+
+        'ingoing' rays keep v = t + r* and are defined everywhere; 'outgoing'
+        rays keep t - r* = v - 2r* and are only defined outside the outer
+        horizon (NaN inside).
+
+        Returns:
+        (value, d value / dτ)
+        """
+        tau = np.asarray(tau, dtype=float)
+        held = tau > self.tau_end
+        tau = np.minimum(tau, self.tau_end)
+        v, r, _, u = self.spline(tau)
+        dv = np.where(held, 0.0, self._derivative(tau)[0])
+        u = np.where(held, 0.0, u)
+        if direction == 'ingoing':
+            return v, dv
+        if direction != 'outgoing':
+            raise ValueError(f"Unknown ray direction: {direction}")
+        outside = r > self.metric.horizons[0]
+        safe_r = np.where(outside, r, np.nan)
+        return v - 2 * self.metric.tortoise(safe_r), dv - 2 * u / self.metric.f(safe_r)
+
+    def _samples(self, direction):
+        """Null coordinate at the interpolation knots, made non-decreasing over its valid prefix"""
+        if direction not in self._null_samples:
+            values = self.null_coordinate(self.taus, direction)[0]
+            invalid = ~np.isfinite(values)
+            end = np.argmax(invalid) if invalid.any() else len(values)
+            self._null_samples[direction] = np.maximum.accumulate(values[:end])
+        return self._null_samples[direction]
+
+    def solve_null_coordinate(self, target, direction='ingoing', tol=1e-12, max_iter=60):
+        """
+        Proper times at which the worldline reaches each target null
+        coordinate, by vectorized safeguarded Newton iteration
+
+        Every target is bracketed between two interpolation knots; Newton
+        steps that leave the bracket fall back to bisection. NaN where the
+        worldline never reaches the target.
+        """
+        target = np.asarray(target, dtype=float)
+        samples = self._samples(direction)
+        k = np.searchsorted(samples, target)
+        reachable = np.isfinite(target) & (len(samples) > 1) & (
+            ((k > 0) & (k < len(samples))) | ((k == 0) & (target == samples[0])))
+        k = np.clip(k, 1, max(len(samples) - 1, 1))
+
+        tau = np.full(target.shape, np.nan)
+        if not reachable.any():
+            return tau
+        goal = target[reachable]
+        low, high = self.taus[k[reachable] - 1], self.taus[k[reachable]]
+        g_low, g_high = samples[k[reachable] - 1], samples[k[reachable]]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            guess = np.where(g_high > g_low, low + (high - low) * (goal - g_low) / (g_high - g_low),
+                             0.5 * (low + high))
+            for _ in range(max_iter):
+                value, slope = self.null_coordinate(guess, direction)
+                residual = value - goal
+                above = residual > 0
+                high = np.where(above, guess, high)
+                low = np.where(above, low, guess)
+                newton = guess - residual / slope
+                inside = np.isfinite(newton) & (newton > low) & (newton < high)
+                updated = np.where(inside, newton, 0.5 * (low + high))
+                converged = np.all(np.abs(updated - guess) <= tol * (1 + np.abs(guess)))
+                guess = updated
+                if converged:
+                    break
+        tau[reachable] = guess
+        return tau
+
+@dataclass
+class SignalExchange:
+    """Radial light signals sent from an emitter worldline to a receiver worldline"""
+    direction: str
+    emitted_tau: np.ndarray  # Emitter's proper time at emission
+    received_tau: np.ndarray  # Receiver's proper time at reception (NaN if never received)
+    null_coordinate: np.ndarray  # v (ingoing) or t - r* (outgoing) carried by each ray
+    emitted_r: np.ndarray
+    received_r: np.ndarray
+    frequency_ratio: np.ndarray  # Received / emitted frequency, dτ_emitter / dτ_receiver
+
+    @property
+    def received(self):
+        """Mask of signals that reach the receiver"""
+        return np.isfinite(self.received_tau)
+
+def exchange_signals(emitter, receiver, emitted_tau, direction='ingoing'):
+    """
+    Trace radial light signals from emitter to receiver
+
+    Each signal is emitted at the emitter's proper time emitted_tau and
+    travels along the radial null ray of the given direction, which keeps
+    its null coordinate constant; the receiver's proper time is the root of
+    receiver.null_coordinate(τ) = that constant. Rays are radial, so for
+    worldlines with angular momentum the azimuth is ignored.
+
+    Parameters:
+    emitter, receiver: Worldline instances in the same metric
+    emitted_tau: Emission proper times (array-like)
+    direction: 'ingoing' (towards smaller r) or 'outgoing' (outside the outer horizon only)
+
+    Returns:
+    SignalExchange
+    """
+    emitted_tau = np.atleast_1d(np.asarray(emitted_tau, dtype=float))
+    in_range = (emitted_tau >= 0) & (emitted_tau <= emitter.tau_max)
+    clipped = np.clip(emitted_tau, 0, emitter.tau_max)
+    value, emitted_slope = emitter.null_coordinate(clipped, direction)
+    value = np.where(in_range, value, np.nan)
+
+    received_tau = receiver.solve_null_coordinate(value, direction)
+    reached = np.isfinite(received_tau)
+    received_r = np.full(emitted_tau.shape, np.nan)
+    received_slope = np.full(emitted_tau.shape, np.nan)
+    received_r[reached] = receiver.radius(received_tau[reached])
+    received_slope[reached] = receiver.null_coordinate(received_tau[reached], direction)[1]
+
+    # A root behind the emitter would need the ray to travel back along itself
+    emitted_r = emitter.radius(clipped)
+    with np.errstate(invalid='ignore'):
+        behind = received_r > emitted_r if direction == 'ingoing' else received_r < emitted_r
+    received_tau[behind] = np.nan
+    received_r[behind] = np.nan
+    with np.errstate(divide='ignore', invalid='ignore'):
+        frequency_ratio = np.where(np.isfinite(received_tau), received_slope / emitted_slope, np.nan)
+
+    return SignalExchange(direction, emitted_tau, received_tau, value,
+                          np.where(in_range, emitted_r, np.nan), received_r, frequency_ratio)
+
+# Malament-Hogarth setup: a charged black hole, an observer falling in from
+# rest and a computer escaping outward with an infinite proper-time future
+DEFAULT_METRIC = ReissnerNordstrom(mass=1.0, charge=0.8)
+OBSERVER_START = (10.0, 0.0)  # r0, dr/dτ
+COMPUTER_START = (8.0, 0.6)
+_default_worldlines = {}
+
+def _worldline(name, tau_max):
+    cached = _default_worldlines.get(name)
+    if cached is None or cached.tau_max < tau_max:
+        r0, u0 = OBSERVER_START if name == 'observer' else COMPUTER_START
+        cached = integrate_geodesics(DEFAULT_METRIC, r0, u0, tau_max=tau_max)
+        _default_worldlines[name] = cached
+    return cached
 
 def compute_worldline_observer(t):
     """
-    Compute the worldline of an observer in Malament-Hogarth spacetime.
-    Using a simple radial trajectory.
+    Compute the worldline of an observer in Malament-Hogarth spacetime:
+    radial free fall from rest at r = 10M into a Reissner-Nordström hole.
+    Returns r at proper times t.
     """
-    # Initial conditions
-    r0 = 10.0  # Starting radius
-    
-    # Radial position over time
-    r = r0 * np.exp(-t/10)
-    
-    return r
+    t = np.asarray(t, dtype=float)
+    r = _worldline('observer', float(np.max(t))).radius(t)[0]
+    return r.reshape(t.shape)[()]  # A scalar for scalar t
 
 def compute_worldline_computer(t):
     """
-    Compute the worldline of the computing system in M-H spacetime.
-    Using a trajectory that approaches the singularity.
-    """
-    # Initial conditions
-    r0 = 8.0  # Starting radius
-    
-    # Radial position over time
-    r = r0 * (1 - t/100)
-    
-    return r
-
-# Time points for simulation
-t = np.linspace(0, 80, 1000)
-
-# Compute worldlines
-r_observer = compute_worldline_observer(t)
-r_computer = compute_worldline_computer(t)
-
-# Create the plot
-plt.figure(figsize=(10, 8))
-plt.plot(t, r_observer, 'b-', label='Observer Worldline')
-plt.plot(t, r_computer, 'r--', label='Computer Worldline')
-
-# Add singularity line
-plt.axhline(y=0, color='k', linestyle=':')
-
-# Customize the plot
-plt.xlabel('Proper Time τ')
-plt.ylabel('Radial Coordinate r')
-plt.title('Worldlines in Malament-Hogarth Spacetime')
-plt.legend()
-plt.grid(True)
-
-# Add annotations
-plt.annotate('Singularity', xy=(40, 0.2), xytext=(45, 2),
-            arrowprops=dict(facecolor='black', shrink=0.05))
-
-plt.annotate('Observer reaches infinity\nin finite proper time', 
-            xy=(70, r_observer[-1]), xytext=(50, 6),
-            arrowprops=dict(facecolor='blue', shrink=0.05))
-
-# Calculate accumulation point
-t_accum = 100  # Time when computer reaches singularity
-r_accum = 0    # Radial coordinate at singularity
-
-plt.annotate('Accumulation Point', xy=(t_accum, r_accum), 
-            xytext=(70, 1),
-            arrowprops=dict(facecolor='red', shrink=0.05))
-
-plt.ylim(-0.5, 12)
-plt.show()
-
-# Calculate some interesting quantities
-infinite_time_ratio = t[-1] / t[0]
-print(f"Ratio of final to initial proper time: {infinite_time_ratio:.2f}")
-
-separation = np.abs(r_observer - r_computer)
-max_separation = np.max(separation)
-print(f"Maximum spatial separation between worldlines: {max_separation:.2f}")
-
-# Estimate proper time remaining for observer
-remaining_time = 10 * np.log(r_observer[-1])  # Based on exponential decay
-print(f"Estimated proper time remaining for observer: {remaining_time:.2f}")
+    Compute the worldline of the computing system in M-H spacetime:
+    an unbound radial geodesic escaping from r = 8M, whose proper time is
+    unbounded. Returns r at proper times t.
+    """
+    t = np.asarray(t, dtype=float)
+    r = _worldline('computer', float(np.max(t))).radius(t)[0]
+    return r.reshape(t.shape)[()]  # A scalar for scalar t
+
+def main():
+    # Proper times for the plot
+    t = np.linspace(0, 80, 1000)
+
+    observer = _worldline('observer', t[-1])
+    computer = _worldline('computer', t[-1])
+    r_observer = observer.radius(t)[0]
+    r_computer = computer.radius(t)[0]
+    outer, inner = DEFAULT_METRIC.horizons
+
+    fig, ax = figure('worldlines', figsize=(10, 8))
+    plot_line(ax, t, r_observer, 'b-', label='Observer Worldline')
+    plot_line(ax, t, r_computer, 'r--', label='Computer Worldline')
+    ax.axhline(y=outer, color='k', linestyle=':', label='Outer horizon')
+    ax.axhline(y=inner, color='gray', linestyle=':', label='Inner horizon')
+
+    ax.set_xlabel('Proper Time τ')
+    ax.set_ylabel('Radial Coordinate r')
+    ax.set_title('Worldlines in Reissner-Nordström Spacetime')
+    ax.legend()
+    ax.grid(True)
+    ax.set_ylim(0, 40)
+    print(f"Worldline plot saved to {finish(fig, 'worldlines.png')}")
+
+    for name, batch in (('Observer', observer), ('Computer', computer)):
+        print(f"\n{name}: E = {batch.energy[0]:.4f}")
+        for event in ('horizon', 'inner_horizon', 'singularity'):
+            tau = batch.events[event][0]
+            if np.isfinite(tau):
+                print(f"  crosses {event.replace('_', ' ')} at τ = {tau:.3f}")
+
+    # Light signals sent inward from the computer to the falling observer
+    signals = exchange_signals(computer.worldline(), observer.worldline(), t, 'ingoing')
+    received = signals.received
+    fig, ax = figure('signals', figsize=(10, 6))
+    plot_line(ax, signals.emitted_tau[received], signals.received_tau[received], 'm-')
+    ax.set_xlabel('Computer Proper Time at Emission')
+    ax.set_ylabel('Observer Proper Time at Reception')
+    ax.set_title('Signals from Computer to Observer')
+    ax.grid(True)
+    print(f"\nSignal plot saved to {finish(fig, 'signals.png')}")
+    if received.any():
+        last = np.flatnonzero(received)[-1]
+        print(f"Observer receives {received.sum()} of {len(t)} signals; the last, sent at "
+              f"τ_computer = {signals.emitted_tau[last]:.3f}, arrives at "
+              f"τ_observer = {signals.received_tau[last]:.3f} "
+              f"(frequency ratio {signals.frequency_ratio[last]:.3g})")
+
+if __name__ == "__main__":
+    main()
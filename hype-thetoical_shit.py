@@ -1,10 +1,10 @@
-import scipy.constants as const
+from PlanckUnits import converter
 
-# Planck units
-planck_length = const.Planck_length
-planck_time = const.Planck_time
-planck_mass = const.Planck_mass
-planck_temperature = const.Planck_temperature
+# Planck units (SI value of one Planck unit)
+planck_length = converter().unit('length')
+planck_time = converter().unit('time')
+planck_mass = converter().unit('mass')
+planck_temperature = converter().unit('temperature')
 
 # Conversion example: meters to Planck length
 def meters_to_planck_length(meters):
@@ -22,13 +22,17 @@ def kilograms_to_planck_mass(kilograms):
 def kelvin_to_planck_temperature(kelvin):
     return kelvin / planck_temperature
 
-# Example usage
-meters = 1.0
-seconds = 1.0
-kilograms = 1.0
-kelvin = 1.0
+def main():
+    # Example usage
+    meters = 1.0
+    seconds = 1.0
+    kilograms = 1.0
+    kelvin = 1.0
 
-print(f"{meters} meters is {meters_to_planck_length(meters)} Planck lengths")
-print(f"{seconds} seconds is {seconds_to_planck_time(seconds)} Planck times")
-print(f"{kilograms} kilograms is {kilograms_to_planck_mass(kilograms)} Planck masses")
-print(f"{kelvin} Kelvin is {kelvin_to_planck_temperature(kelvin)} Planck temperatures")
+    print(f"{meters} meters is {meters_to_planck_length(meters)} Planck lengths")
+    print(f"{seconds} seconds is {seconds_to_planck_time(seconds)} Planck times")
+    print(f"{kilograms} kilograms is {kilograms_to_planck_mass(kilograms)} Planck masses")
+    print(f"{kelvin} Kelvin is {kelvin_to_planck_temperature(kelvin)} Planck temperatures")
+
+if __name__ == "__main__":
+    main()